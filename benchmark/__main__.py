@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import sys
+
+from .compare import compare_reports, format_rows, DEFAULT_THRESHOLD, REGRESSION, ADDED
+from .suite import run_suite, DEFAULT_REPEAT
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Time the stages of the solver.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write a JSON report")
+    run_parser.add_argument("-o", "--output", help="report file, stdout when omitted")
+    run_parser.add_argument("--baseline", action="store_true", help="overwrite the stored baseline with the report")
+
+    compare_parser = commands.add_parser("compare", help="compare a report with a baseline, exit with 1 on regressions")
+    compare_parser.add_argument("current", nargs="?", help="report to compare, the suite is run when omitted")
+    compare_parser.add_argument("--against", default=BASELINE_PATH, help="baseline report, the stored one by default")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown counted as a regression, 0.2 by default")
+
+    for subparser in [run_parser, compare_parser]:
+        subparser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT, help="measurements per case")
+        subparser.add_argument("-k", "--filter", help="only the cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.baseline and args.filter is not None:
+            parser.error("the baseline records every case, --baseline cannot be combined with --filter")
+        report = run_suite(args.repeat, args.filter)
+        if args.baseline:
+            save_report(report, BASELINE_PATH)
+        if args.output is not None:
+            save_report(report, args.output)
+        elif not args.baseline:
+            json.dump(report, sys.stdout, indent=2, sort_keys=True)
+            print()
+        return 0
+
+    baseline = load_report(args.against)
+    current = load_report(args.current) if args.current is not None else run_suite(args.repeat, args.filter)
+    if args.filter is not None:
+        baseline["results"] = {name: result for name, result in baseline["results"].items() if args.filter in name}
+    rows = compare_reports(baseline, current, args.threshold)
+    print(format_rows(rows))
+    regressions = sum(1 for row in rows if row[4] == REGRESSION)
+    # a case the baseline does not have is not covered by the gate, the baseline has to be recorded again
+    added = sum(1 for row in rows if row[4] == ADDED)
+    if regressions > 0:
+        print("{} case(s) slower than the baseline by more than {:.0%}".format(regressions, args.threshold))
+    if added > 0:
+        print("{} case(s) missing from the baseline, record it again with run --baseline".format(added))
+    return 1 if regressions > 0 or added > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import unittest
+
+# a case is a regression when it is this fraction slower than the baseline
+DEFAULT_THRESHOLD = 0.2
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+ADDED = "added"
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    # (name, baseline seconds, current seconds, ratio, status) for every case of either report, by name
+    rows = []
+    baseline_results = baseline["results"]
+    current_results = current["results"]
+    for name in sorted(set(baseline_results) | set(current_results)):
+        if name not in current_results:
+            rows.append((name, baseline_results[name]["seconds"], None, None, MISSING))
+            continue
+        if name not in baseline_results:
+            rows.append((name, None, current_results[name]["seconds"], None, ADDED))
+            continue
+
+        before = baseline_results[name]["seconds"]
+        after = current_results[name]["seconds"]
+        ratio = after / before
+        if ratio > 1 + threshold:
+            status = REGRESSION
+        elif ratio < 1 / (1 + threshold):
+            status = IMPROVEMENT
+        else:
+            status = UNCHANGED
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def format_rows(rows):
+    def format_time(seconds):
+        return "-" if seconds is None else "{:.2f} us".format(seconds * 1e6)
+
+    lines = ["{:<70} {:>14} {:>14} {:>8}  {}".format("case", "baseline", "current", "ratio", "status")]
+    for name, before, after, ratio, status in rows:
+        lines.append("{:<70} {:>14} {:>14} {:>8}  {}".format(
+            name, format_time(before), format_time(after), "-" if ratio is None else "{:.2f}".format(ratio), status))
+    return "\n".join(lines)
+
+
+class Tests(unittest.TestCase):
+
+    def test_compare_reports(self):
+        baseline = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 1.0},
+                                "d": {"seconds": 1.0}}}
+        current = {"results": {"a": {"seconds": 1.1}, "b": {"seconds": 1.5}, "c": {"seconds": 0.5},
+                               "e": {"seconds": 1.0}}}
+        self.assertEqual(compare_reports(baseline, current), [
+            ("a", 1.0, 1.1, 1.1, UNCHANGED),
+            ("b", 1.0, 1.5, 1.5, REGRESSION),
+            ("c", 1.0, 0.5, 0.5, IMPROVEMENT),
+            ("d", 1.0, None, None, MISSING),
+            ("e", None, 1.0, None, ADDED),
+        ])
+        self.assertEqual(compare_reports(baseline, current, threshold=0.6)[1][4], UNCHANGED)
@@ -0,0 +1,142 @@
+import platform
+import statistics
+import sys
+import time
+import unittest
+from typing import Callable, List, NamedTuple
+
+from convert_to_postfix import convert_infix_to_postfix
+from convert_to_token_list import convert_to_token_list, tokenize
+from polynomial import evaluate_postfix, parse_to_polynomial
+from solve import solve_equation, solve_with_complex_roots, ADAPTIVE, DERIVATIVE
+from .workloads import generate_expressions, generate_polynomials, generate_equations
+
+EXPRESSION_TERMS = [4, 16, 64]
+DEGREES = [8, 64, 256]
+COEFFICIENT_MAGNITUDES = [10, 10 ** 6]
+POWER_EXPONENTS = [4, 16, 64]
+EQUATION_DEGREES = [5, 12]
+EQUATION_MAGNITUDES = [10, 1000]
+EPSILONS = [0.00001, 1e-12]
+EVAL_POINTS = [-2.5, -1, -0.1, 0, 0.3, 1, 1.7, 40]
+COMPLEX_ROOT_DEGREES = [12, 64]
+SPARSE_EQUATIONS = ["x^1000-3*x^500+2", "x^1001-3*x^500+2", "x^999-5*x^300+x^7-1"]
+
+# a measurement is repeated until it lasts at least this long, so that short operations are timed accurately
+MIN_MEASUREMENT_TIME = 0.02
+DEFAULT_REPEAT = 5
+
+
+class Case(NamedTuple):
+    name: str
+    function: Callable
+    inputs: List
+
+
+def get_cases():
+    cases = []
+    for terms in EXPRESSION_TERMS:
+        expressions = generate_expressions(50, terms)
+        token_lists = [tokenize(expression) for expression in expressions]
+        postfix_lists = [convert_infix_to_postfix(token_list) for token_list in token_lists]
+        cases.append(Case("tokenize/terms={}".format(terms), convert_to_token_list, expressions))
+        cases.append(Case("postfix/terms={}".format(terms), convert_infix_to_postfix, token_lists))
+        cases.append(Case("evaluate_postfix/terms={}".format(terms), evaluate_postfix, postfix_lists))
+
+    for degree in DEGREES:
+        for magnitude in COEFFICIENT_MAGNITUDES:
+            for integral in [False, True]:
+                polynomials = generate_polynomials(20, degree, magnitude, integral)
+                cases.append(Case("multiply/degree={}/magnitude={}/integral={}".format(degree, magnitude, integral),
+                                  lambda pair: pair[0].multiply(pair[1]),
+                                  list(zip(polynomials, polynomials[1:]))))
+        polynomials = generate_polynomials(20, degree)
+        cases.append(Case("eval/degree={}".format(degree),
+                          lambda polynomial: [polynomial.eval(x) for x in EVAL_POINTS], polynomials))
+        cases.append(Case("compiled_eval/degree={}".format(degree),
+                          lambda evaluate: [evaluate(x) for x in EVAL_POINTS],
+                          [polynomial.compile() for polynomial in polynomials]))
+
+    for exponent in POWER_EXPONENTS:
+        for integral in [False, True]:
+            polynomials = generate_polynomials(10, 3, 10, integral)
+            cases.append(Case("power/degree=3/exponent={}/integral={}".format(exponent, integral),
+                              lambda polynomial, exponent=exponent: polynomial.power(exponent), polynomials))
+
+    for degree in EQUATION_DEGREES:
+        for magnitude in EQUATION_MAGNITUDES:
+            for epsilon in EPSILONS:
+                for rational in [False, True]:
+                    polynomials = generate_equations(10, degree, magnitude, rational)
+                    cases.append(Case("solve_equation/degree={}/magnitude={}/epsilon={}/rational={}".format(
+                        degree, magnitude, epsilon, rational),
+                        lambda polynomial, epsilon=epsilon: solve_equation(polynomial, epsilon), polynomials))
+
+    for degree in EQUATION_DEGREES:
+        polynomials = generate_equations(10, degree, max(EQUATION_MAGNITUDES))
+        for epsilon in EPSILONS:
+            cases.append(Case("solve_adaptive/degree={}/magnitude={}/epsilon={}".format(
+                degree, max(EQUATION_MAGNITUDES), epsilon),
+                lambda polynomial, epsilon=epsilon: solve_equation(polynomial, epsilon, ADAPTIVE, method=DERIVATIVE),
+                polynomials))
+
+    for degree in COMPLEX_ROOT_DEGREES:
+        cases.append(Case("solve_with_complex_roots/degree={}".format(degree),
+                          lambda polynomial: solve_with_complex_roots(polynomial, 1e-12),
+                          generate_polynomials(10, degree)))
+
+    cases.append(Case("solve_equation/sparse", lambda polynomial: solve_equation(polynomial, 1e-12),
+                      [parse_to_polynomial(expression) for expression in SPARSE_EQUATIONS]))
+
+    return cases
+
+
+def run_batch(case, loops):
+    start = time.perf_counter()
+    for i in range(loops):
+        for item in case.inputs:
+            case.function(item)
+    return time.perf_counter() - start
+
+
+def measure(case, repeat=DEFAULT_REPEAT):
+    # Seconds per operation: the fastest and the median of repeat measurements
+    loops = 1
+    while run_batch(case, loops) < MIN_MEASUREMENT_TIME:
+        loops *= 2
+    operations = loops * len(case.inputs)
+    timings = [run_batch(case, loops) / operations for i in range(repeat)]
+    return {"seconds": min(timings), "median": statistics.median(timings), "operations": operations}
+
+
+def get_environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_suite(repeat=DEFAULT_REPEAT, name_filter=None, log=sys.stderr):
+    results = {}
+    for case in get_cases():
+        if name_filter is not None and name_filter not in case.name:
+            continue
+        results[case.name] = measure(case, repeat)
+        if log is not None:
+            print("{:<70} {:>12.2f} us".format(case.name, results[case.name]["seconds"] * 1e6), file=log)
+    return {"environment": get_environment(), "results": results}
+
+
+class Tests(unittest.TestCase):
+
+    def test_case_names_are_unique(self):
+        names = [case.name for case in get_cases()]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_run_suite(self):
+        report = run_suite(repeat=1, name_filter="tokenize/terms=4", log=None)
+        self.assertEqual(list(report["results"]), ["tokenize/terms=4"])
+        self.assertGreater(report["results"]["tokenize/terms=4"]["seconds"], 0)
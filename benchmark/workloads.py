@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from polynomial import Polynomial
+
+# every workload is generated from a fixed seed, so two runs time exactly the same inputs
+SEED = 20201018
+
+
+def get_random(*parameters):
+    return random.Random("{}:{}".format(SEED, parameters))
+
+
+def generate_term(rng, degree, magnitude):
+    coefficient = rng.randint(1, magnitude)
+    power = rng.randint(0, degree)
+    shape = rng.randrange(3)
+    if shape == 0:
+        return "{}*x^{}".format(coefficient, power)
+    if shape == 1:
+        return "({}*x-{})^{}".format(rng.randint(1, 9), coefficient, min(power, 3))
+    return "{}*(x+{})*(x-{})".format(coefficient, rng.randint(1, magnitude), rng.randint(1, magnitude))
+
+
+def generate_expressions(count, terms, degree=4, magnitude=100):
+    # count expressions of the given number of terms joined by + and -
+    rng = get_random("expressions", count, terms, degree, magnitude)
+    expressions = []
+    for i in range(count):
+        expression = generate_term(rng, degree, magnitude)
+        for j in range(terms - 1):
+            expression += rng.choice("+-") + generate_term(rng, degree, magnitude)
+        expressions.append(expression)
+    return expressions
+
+
+def generate_polynomials(count, degree, magnitude=100, integral=False):
+    # polynomials with random coefficients in [-magnitude, magnitude] and a leading coefficient of at least 1
+    rng = get_random("polynomials", count, degree, magnitude, integral)
+    polynomials = []
+    for i in range(count):
+        coefficients = [rng.uniform(-magnitude, magnitude) for j in range(degree)]
+        coefficients.append(rng.choice([-1, 1]) * rng.uniform(1, magnitude))
+        if integral:
+            coefficients = [float(round(coefficient)) for coefficient in coefficients]
+        polynomials.append(Polynomial.from_coefficients(coefficients))
+    return polynomials
+
+
+def generate_equations(count, degree, magnitude=100, rational=False):
+    # Polynomials with degree - 2 real roots spread over [-magnitude, magnitude] and one pair of complex roots. With
+    # rational the coefficients and the real roots are integers, which the exact rational root pass resolves without numeric search.
+    rng = get_random("equations", count, degree, magnitude, rational)
+    polynomials = []
+    for i in range(count):
+        coefficients = [rng.randint(1, magnitude) if rational else rng.uniform(1, magnitude), 0, 1]
+        for j in range(degree - 2):
+            root = rng.randint(-magnitude, magnitude) if rational else rng.uniform(-magnitude, magnitude)
+            coefficients = [-root * coefficients[0]] + [coefficients[k - 1] - root * coefficients[k]
+                                                        for k in range(1, len(coefficients))] + [coefficients[-1]]
+        polynomials.append(Polynomial.from_coefficients(coefficients))
+    return polynomials
+
+
+class Tests(unittest.TestCase):
+
+    def test_workloads_are_reproducible(self):
+        self.assertEqual(generate_expressions(3, 5), generate_expressions(3, 5))
+        self.assertEqual(generate_polynomials(3, 8), generate_polynomials(3, 8))
+        self.assertNotEqual(generate_expressions(3, 5), generate_expressions(3, 6)[:3])
+
+    def test_generate_equations(self):
+        for polynomial in generate_equations(5, 6, 10, rational=True):
+            self.assertEqual(polynomial.get_highest_degree(), 6)
+            integer_roots = [x for x in range(-10, 11) if polynomial.eval(x) == 0]
+            self.assertGreaterEqual(len(integer_roots), 1)
@@ -1,7 +1,148 @@
-# This is a sample Python script.
+import argparse
+import json
+import os
+import sys
+import unittest
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
 
-# Press Shift+F10 to execute it or replace it with your code.
-# Press Double Shift to search everywhere for classes, files, tool windows, actions, and settings.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver"))
 
+from solve import parse_and_solve_and_round  # noqa: E402
 
+DEFAULT_EPSILON = 0.00001
+# lines sent to a worker at once, large enough that the pipe overhead is small next to solving
+DEFAULT_CHUNKSIZE = 64
+# chunks submitted ahead of the output per worker, this is what bounds the memory held by pending results
+PENDING_CHUNKS_PER_WORKER = 4
 
+
+def parse_line(line, default_epsilon):
+    # "expression", "expression<TAB>epsilon" or a JSON object {"expression": ..., "epsilon": ...}
+    line = line.strip()
+    if line.startswith("{"):
+        request = json.loads(line)
+        expression = request["expression"]
+        epsilon = float(request.get("epsilon", default_epsilon))
+    else:
+        expression, separator, epsilon = line.partition("\t")
+        epsilon = float(epsilon) if separator else default_epsilon
+
+    if not isinstance(expression, str):
+        raise TypeError("Expression must be a string")
+    if not epsilon > 0:
+        raise ValueError("Epsilon must be positive")
+    return expression, epsilon
+
+
+def solve_line(number, line, default_epsilon):
+    record = {"line": number}
+    try:
+        expression, epsilon = parse_line(line, default_epsilon)
+        record["expression"] = expression
+        record["roots"] = parse_and_solve_and_round(expression, epsilon)
+    except Exception as error:
+        # one bad line must not stop the whole batch
+        record["error"] = {"type": type(error).__name__, "message": str(error)}
+    return json.dumps(record)
+
+
+def read_chunks(lines, chunksize):
+    # Lists of (line number, line) read lazily, blank lines are skipped but still counted
+    numbered_lines = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered_lines, chunksize))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def solve_chunk(chunk, default_epsilon):
+    return [solve_line(number, line, default_epsilon) for number, line in chunk]
+
+
+def take_finished(pending, ordered):
+    # Records of at least one finished chunk, always the oldest chunk when the output is ordered
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield from future.result()
+
+
+def solve_stream(lines, default_epsilon=DEFAULT_EPSILON, workers=1, ordered=True, chunksize=DEFAULT_CHUNKSIZE):
+    # One JSON record per non-blank line of lines. Input is consumed lazily and at most
+    # workers * PENDING_CHUNKS_PER_WORKER chunks are in flight, so memory does not grow with the input.
+    chunks = read_chunks(lines, chunksize)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from solve_chunk(chunk, default_epsilon)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, chunk, default_epsilon))
+            if len(pending) >= workers * PENDING_CHUNKS_PER_WORKER:
+                yield from take_finished(pending, ordered)
+        while len(pending) > 0:
+            yield from take_finished(pending, ordered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve polynomial equations given one per line, the roots are "
+                                                 "written as JSON lines.")
+    parser.add_argument("input", nargs="?", default="-", help="input file, stdin when omitted or -")
+    parser.add_argument("-o", "--output", default="-", help="output file, stdout when omitted or -")
+    parser.add_argument("-e", "--epsilon", type=float, default=DEFAULT_EPSILON,
+                        help="precision for lines that do not give their own")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes, 0 for one per CPU")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write each record as soon as it is ready instead of in input order")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="lines sent to a worker at once")
+    args = parser.parse_args(argv)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for record in solve_stream(input_file, args.epsilon, workers, not args.unordered, max(1, args.chunksize)):
+            output_file.write(record + "\n")
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+class Tests(unittest.TestCase):
+
+    def test_parse_line(self):
+        self.assertEqual(parse_line("x^2-1\n", 0.001), ("x^2-1", 0.001))
+        self.assertEqual(parse_line("x^2-1\t1e-9\n", 0.001), ("x^2-1", 1e-9))
+        self.assertEqual(parse_line('{"expression": "x=2", "epsilon": 0.01}', 0.001), ("x=2", 0.01))
+        self.assertEqual(parse_line('{"expression": "x=2"}', 0.001), ("x=2", 0.001))
+        self.assertRaises(ValueError, parse_line, "x\t0", 0.001)
+        self.assertRaises(KeyError, parse_line, '{"epsilon": 0.01}', 0.001)
+
+    def test_solve_stream(self):
+        lines = ["x^2-1\n", "\n", "x^2+2*x+1=0\t0.1\n", "x^2+(\n", '{"expression": "x^2-2", "epsilon": 0.01}\n']
+        records = [json.loads(record) for record in solve_stream(lines)]
+        self.assertEqual(records[0], {"line": 1, "expression": "x^2-1", "roots": [-1, 1]})
+        self.assertEqual(records[1], {"line": 3, "expression": "x^2+2*x+1=0", "roots": [-1]})
+        self.assertEqual((records[2]["line"], records[2]["error"]["type"]), (4, "ExpressionSyntaxError"))
+        self.assertEqual(records[3], {"line": 5, "expression": "x^2-2", "roots": [-1.4, 1.4]})
+
+    def test_solve_stream_with_workers(self):
+        lines = ["x^2-{}".format(number * number) for number in range(1, 41)]
+        expected_records = list(solve_stream(lines))
+        self.assertEqual(list(solve_stream(lines, workers=2, chunksize=3)), expected_records)
+        unordered_records = list(solve_stream(lines, workers=2, ordered=False, chunksize=3))
+        self.assertEqual(sorted(unordered_records, key=lambda record: json.loads(record)["line"]), expected_records)
+
+
+if __name__ == '__main__':
+    main()
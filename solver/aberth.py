@@ -0,0 +1,178 @@
+import unittest
+from cmath import rect
+from math import pi
+
+from adaptive_precision import gamma
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# relative size of a correction below which a root has converged
+ABERTH_TOLERANCE = 1e-15
+MAX_ABERTH_ITERATIONS = 200
+# an approximation is left alone once p has been rounding noise there for this many iterations in a row. The noise
+# bound is a worst case, ill-conditioned roots keep moving towards the real axis for a few iterations inside it.
+NOISE_ITERATIONS = 8
+# below this degree the NumPy overhead on small arrays costs more than the vectorization saves
+VECTORIZED_MIN_DEGREE = 24
+# the initial approximations are evenly spread on a circle, rotated by this angle so that none of them starts on
+# the real axis, from where a conjugate pair of roots could not be reached
+INITIAL_ANGLE = 0.4
+
+
+def get_initial_approximations(coefficients):
+    # n points on the circle whose radius is the geometric mean of the moduli of the roots, |a0 / an|^(1/n)
+    degree = len(coefficients) - 1
+    radius = abs(coefficients[0] / coefficients[-1]) ** (1 / degree)
+    return [rect(radius, INITIAL_ANGLE + 2 * pi * k / degree) for k in range(degree)]
+
+
+def get_logarithmic_derivative(coefficients, z):
+    # (p'(z) / p(z), |p(z)| is within the rounding error of its evaluation), or (None, True) when p(z) is 0.
+    # Outside the unit circle Horner's rule overflows for high degrees, there p'(z) / p(z) = y (n - y q'(y) / q(y))
+    # with y = 1 / z and q(y) = y^n p(1 / y) the polynomial with the coefficients in reverse order.
+    degree = len(coefficients) - 1
+    outside = abs(z) > 1
+    y = 1 / z if outside else z
+    value = slope = absolute_value = 0
+    for coefficient in (coefficients if outside else reversed(coefficients)):
+        slope = slope * y + value
+        value = value * y + coefficient
+        absolute_value = absolute_value * abs(y) + abs(coefficient)
+    if value == 0:
+        return None, True
+    is_noise = abs(value) <= gamma(2 * degree) * absolute_value
+    if outside:
+        return y * (degree - y * slope / value), is_noise
+    return slope / value, is_noise
+
+
+def refine_roots(coefficients, roots):
+    # Aberth–Ehrlich iteration: every approximation z_k takes a Newton step on p(x) / prod(x - z_j, j != k), which
+    # keeps the approximations away from each other. A root is left alone once its correction is negligible or p has
+    # stayed rounding noise there (see NOISE_ITERATIONS). Updates are used as soon as they are computed (Gauss–Seidel).
+    # Reference: https://en.wikipedia.org/wiki/Aberth_method
+    roots = list(roots)
+    converged = [False] * len(roots)
+    noise_counts = [0] * len(roots)
+    for iteration in range(MAX_ABERTH_ITERATIONS):
+        for k, z in enumerate(roots):
+            if converged[k]:
+                continue
+            ratio, is_noise = get_logarithmic_derivative(coefficients, z)
+            if ratio is None:
+                converged[k] = True
+                continue
+            noise_counts[k] = noise_counts[k] + 1 if is_noise else 0
+            if noise_counts[k] >= NOISE_ITERATIONS:
+                converged[k] = True
+                continue
+            repulsion = sum(1 / (z - other) for j, other in enumerate(roots) if j != k and other != z)
+            if ratio == repulsion:
+                continue
+            correction = 1 / (ratio - repulsion)
+            roots[k] = z - correction
+            converged[k] = abs(correction) <= ABERTH_TOLERANCE * abs(roots[k])
+        if all(converged):
+            break
+    return roots
+
+
+def refine_roots_vectorized(coefficients, roots):
+    # refine_roots on NumPy arrays, every active approximation is updated at once from the previous ones (Jacobi)
+    coefficients = numpy.asarray(coefficients, dtype=numpy.float64)
+    degree = len(coefficients) - 1
+    noise_factor = gamma(2 * degree)
+    roots = numpy.array(roots, dtype=numpy.complex128)
+    active = numpy.arange(len(roots))
+    noise_counts = numpy.zeros(len(roots), dtype=int)
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(MAX_ABERTH_ITERATIONS):
+            if len(active) == 0:
+                break
+            z = roots[active]
+            outside = numpy.abs(z) > 1
+            y = numpy.where(outside, 1 / z, z)
+            absolute_y = numpy.abs(y)
+            value = numpy.zeros_like(z)
+            slope = numpy.zeros_like(z)
+            absolute_value = numpy.zeros(len(z))
+            # row k holds the coefficients Horner's rule takes for z_k, highest degree first
+            rows = numpy.where(outside[:, None], coefficients, coefficients[::-1])
+            for coefficient in rows.T:
+                slope = slope * y + value
+                value = value * y + coefficient
+                absolute_value = absolute_value * absolute_y + numpy.abs(coefficient)
+            ratio = numpy.where(outside, y * (degree - y * slope / value), slope / value)
+
+            differences = z[:, None] - roots[None, :]
+            differences[numpy.arange(len(active)), active] = numpy.inf
+            repulsion = (1 / differences).sum(axis=1)
+            correction = 1 / (ratio - repulsion)
+            # p(z) = 0 gives an infinite ratio and a correction of 0, ratio == repulsion an infinite correction
+            correction[~numpy.isfinite(correction)] = 0
+            is_noise = numpy.abs(value) <= noise_factor * absolute_value
+            noise_counts[active] = numpy.where(is_noise, noise_counts[active] + 1, 0)
+            is_noise = noise_counts[active] >= NOISE_ITERATIONS
+            correction[is_noise] = 0
+
+            roots[active] = z - correction
+            converged = is_noise | (numpy.abs(correction) <= ABERTH_TOLERANCE * numpy.abs(roots[active]))
+            active = active[~converged]
+    return [complex(z) for z in roots]
+
+
+def find_all_roots_simultaneously(coefficients):
+    # All roots of a polynomial with real coefficients (ascending order of degree, non-zero leading coefficient),
+    # repeated by multiplicity. The approximations of all of them are refined together, on NumPy arrays for high
+    # degrees when NumPy is available.
+    coefficients = list(coefficients)
+    lowest_degree = next(degree for degree, coefficient in enumerate(coefficients) if coefficient != 0)
+    roots = [0j] * lowest_degree
+    coefficients = coefficients[lowest_degree:]
+    if len(coefficients) == 1:
+        return roots
+    if len(coefficients) == 2:
+        return roots + [complex(-coefficients[0] / coefficients[1])]
+
+    initial_approximations = get_initial_approximations(coefficients)
+    if numpy is not None and len(coefficients) - 1 >= VECTORIZED_MIN_DEGREE:
+        return roots + refine_roots_vectorized(coefficients, initial_approximations)
+    return roots + refine_roots(coefficients, initial_approximations)
+
+
+class Tests(unittest.TestCase):
+
+    def assert_roots(self, roots, expected_roots, delta):
+        self.assertEqual(len(roots), len(expected_roots))
+        for expected_root in expected_roots:
+            self.assertLess(min(abs(root - expected_root) for root in roots), delta)
+
+    def test_get_logarithmic_derivative(self):
+        # x^3 - 2x + 1 at 2 and at 0.5
+        self.assertEqual(get_logarithmic_derivative([1, -2, 0, 1], 2)[0], 2)
+        self.assertAlmostEqual(get_logarithmic_derivative([1, -2, 0, 1], 0.5)[0], -1.25 / 0.125)
+        self.assertEqual(get_logarithmic_derivative([1, -2, 0, 1], 1), (None, True))
+
+    def test_refine_roots(self):
+        # (x - 1)(x - 2)(x - 3)(x^2 + 1)(x^2 + 4x + 5)
+        coefficients = [-30.0, 31.0, -22.0, 23.0, 6.0, -7.0, -2.0, 1.0]
+        expected_roots = [1, 2, 3, 1j, -1j, -2 + 1j, -2 - 1j]
+        refiners = [refine_roots] + ([refine_roots_vectorized] if numpy is not None else [])
+        for refine in refiners:
+            roots = refine(coefficients, get_initial_approximations(coefficients))
+            self.assert_roots(roots, expected_roots, 1e-12)
+
+    def test_find_all_roots_simultaneously(self):
+        self.assert_roots(find_all_roots_simultaneously([6, 11, 6]), [(-11 + 23 ** 0.5 * 1j) / 12,
+                                                                     (-11 - 23 ** 0.5 * 1j) / 12], 1e-14)
+        self.assert_roots(find_all_roots_simultaneously([0, 0, -2, 1]), [0, 0, 2], 1e-14)
+        self.assert_roots(find_all_roots_simultaneously([1, 0, 0, 0, 0, 0, 1]),
+                          [rect(1, pi / 6 + k * pi / 3) for k in range(6)], 1e-14)
+        # x^100 - 1 overflows Horner's rule outside the unit circle without the reversed polynomial
+        self.assert_roots(find_all_roots_simultaneously([-1] + [0] * 99 + [1]),
+                          [rect(1, 2 * pi * k / 100) for k in range(100)], 1e-12)
+        # a double root is only found to about the square root of the precision
+        self.assert_roots(find_all_roots_simultaneously([4, -4, 1]), [2, 2], 1e-6)
@@ -0,0 +1,186 @@
+import sys
+import unittest
+from collections import Counter
+from fractions import Fraction
+
+from polynomial import Polynomial, parse_to_polynomial
+
+INF = float('inf')
+MINUS_INF = float('-inf')
+
+# unit roundoff of float64
+UNIT_ROUNDOFF = sys.float_info.epsilon / 2
+# 2^27 + 1, splits a float into two halves of 26 bits whose products are exact
+SPLITTER = 134217729.0
+
+
+def gamma(n):
+    # Bound on the relative error accumulated by n floating point operations, see Higham, Accuracy and Stability of
+    # Numerical Algorithms, 3.1
+    return n * UNIT_ROUNDOFF / (1 - n * UNIT_ROUNDOFF)
+
+
+def two_sum(a, b):
+    # s + e == a + b exactly, with s the rounded sum
+    s = a + b
+    z = s - a
+    return s, (a - (s - z)) + (b - z)
+
+
+def split(a):
+    c = SPLITTER * a
+    high = c - (c - a)
+    return high, a - high
+
+
+def two_product(a, b):
+    # p + e == a * b exactly, with p the rounded product (Dekker)
+    p = a * b
+    a_high, a_low = split(a)
+    b_high, b_low = split(b)
+    return p, a_low * b_low - (((p - a_high * b_high) - a_low * b_high) - a_high * b_low)
+
+
+def compensated_horner(coefficients, x):
+    # Horner's rule keeping the rounding error of every step and adding their Horner sum back at the end. The result
+    # is as accurate as Horner's rule in twice the working precision, and its error is at most
+    # u |p(x)| + gamma(2n)^2 p~(|x|), p~ having the absolute values of the coefficients of p.
+    # two_product and two_sum are inlined, this runs on every evaluation Horner's rule cannot decide.
+    # Reference: Graillat, Langlois, Louvet, Compensated Horner scheme, 2005
+    c = SPLITTER * x
+    x_high = c - (c - x)
+    x_low = x - x_high
+    result = 0.0
+    correction = 0.0
+    for coefficient in reversed(coefficients):
+        product = result * x
+        c = SPLITTER * result
+        result_high = c - (c - result)
+        result_low = result - result_high
+        product_error = result_low * x_low - (((product - result_high * x_high) - result_low * x_high) -
+                                              result_high * x_low)
+        result = product + coefficient
+        z = result - product
+        sum_error = (product - (result - z)) + (coefficient - z)
+        correction = correction * x + (product_error + sum_error)
+    return result + correction
+
+
+def exact_sign(coefficients, x):
+    # Sign of the polynomial at x computed with integers. Every float is a fraction whose denominator is a power of
+    # two, multiplying p(x) by the common denominator of the coefficients and by the denominator of x to the degree
+    # gives an integer of the same sign.
+    if len(coefficients) == 0:
+        return 0
+    ratios = [coefficient.as_integer_ratio() for coefficient in coefficients]
+    common_denominator = max(denominator for numerator, denominator in ratios)
+    numerators = [numerator * (common_denominator // denominator) for numerator, denominator in ratios]
+    x_numerator, x_denominator = x.as_integer_ratio()
+
+    result = numerators[-1]
+    power = 1
+    for numerator in reversed(numerators[:-1]):
+        power *= x_denominator
+        result = result * x_numerator + numerator * power
+    return (result > 0) - (result < 0)
+
+
+def get_error_bound(coefficients, radius):
+    # SignEvaluator.get_error_bound computed from the coefficients, cheaper when only a few points are checked
+    degree = len(coefficients) - 1
+    absolute_value = 0.0
+    for coefficient in reversed(coefficients):
+        absolute_value = absolute_value * radius + abs(coefficient)
+    return gamma(2 * degree + 2) * absolute_value + 4 * (degree + 1) * sys.float_info.min
+
+
+def get_sign_of_limit(polynomial, x):
+    value = polynomial.eval(x)
+    return (value > 0) - (value < 0)
+
+
+class SignEvaluator:
+    # Sign of a polynomial at a float x, always the sign of the exact value of the polynomial there. Horner's rule is
+    # tried first and its result is trusted when it is farther from 0 than its error bound. Otherwise the compensated
+    # Horner scheme is tried, and only when the value is still within its error bound of 0 is the sign computed
+    # exactly. counter["compensated_evaluations"] and counter["exact_evaluations"] count the escalations.
+    def __init__(self, polynomial, counter=None):
+        self.polynomial = polynomial
+        self.coefficients = polynomial.coefficients
+        self.counter = counter
+        self.evaluate = polynomial.compile()
+        # p~(|x|) bounds the size of every partial sum of Horner's rule
+        self.evaluate_absolute = Polynomial.from_coefficients(map(abs, self.coefficients)).compile()
+        degree = polynomial.get_highest_degree()
+        self.horner_factor = gamma(2 * degree + 2)
+        self.compensated_factor = gamma(2 * degree + 2) ** 2
+        # the bounds assume no underflow, every one of the 2n operations may add up to the smallest normal float
+        self.underflow = 4 * (degree + 1) * sys.float_info.min
+
+    def __call__(self, x):
+        if x == INF or x == MINUS_INF:
+            return get_sign_of_limit(self.polynomial, x)
+        return self.get_sign(x, self.evaluate(x))
+
+    def get_error_bound(self, radius):
+        # Bound on the error of Horner's rule at any x with |x| <= radius
+        # Higham, Accuracy and Stability of Numerical Algorithms, 5.1: |p(x) - horner(x)| <= gamma(2n) p~(|x|)
+        return self.horner_factor * self.evaluate_absolute(radius) + self.underflow
+
+    def get_sign(self, x, value):
+        # sign at a finite x given value, the result of Horner's rule there
+        absolute_value = self.evaluate_absolute(abs(x))
+        if abs(value) > self.horner_factor * absolute_value + self.underflow:
+            return (value > 0) - (value < 0)
+
+        if self.counter is not None:
+            self.counter["compensated_evaluations"] += 1
+        value = compensated_horner(self.coefficients, x)
+        if abs(value) > 2 * (UNIT_ROUNDOFF * abs(value) + self.compensated_factor * absolute_value) + self.underflow:
+            return (value > 0) - (value < 0)
+
+        if self.counter is not None:
+            self.counter["exact_evaluations"] += 1
+        return exact_sign(self.coefficients, x)
+
+
+class Tests(unittest.TestCase):
+
+    def test_error_free_transformations(self):
+        self.assertEqual(two_sum(1.0, 1e-20), (1.0, 1e-20))
+        product, error = two_product(1 + 2 ** -30, 1 + 2 ** -30)
+        self.assertEqual((product, error), (1 + 2 ** -29, 2 ** -60))
+
+    def test_compensated_horner(self):
+        # (x - 0.75)^5 near its root, where Horner's rule returns rounding noise
+        coefficients = parse_to_polynomial("(x-0.75)^5").coefficients
+        for x in [0.7, 0.74, 0.7499, 0.751, 0.8]:
+            self.assertAlmostEqual(compensated_horner(coefficients, x), (x - 0.75) ** 5, delta=1e-25)
+        self.assertEqual(compensated_horner(coefficients, 0.75), 0)
+        self.assertEqual(compensated_horner((), 2.0), 0)
+
+    def test_exact_sign(self):
+        coefficients = parse_to_polynomial("(x-2)^9").coefficients
+        self.assertEqual([exact_sign(coefficients, x) for x in [1.99, 2 - 2 ** -40, 2.0, 2 + 2 ** -40, 2.01]],
+                         [-1, -1, 0, 1, 1])
+        x = 0.1 ** 0.5
+        value = Fraction(x) ** 2 - Fraction(0.1)
+        self.assertEqual(exact_sign(parse_to_polynomial("x^2-0.1").coefficients, x), (value > 0) - (value < 0))
+        self.assertEqual(exact_sign((), 3.0), 0)
+
+    def test_sign_evaluator(self):
+        polynomial = parse_to_polynomial("(x-2)^9")
+        counter = Counter()
+        sign = SignEvaluator(polynomial, counter)
+        points = [2 + k / 1000 for k in range(-80, 81)]
+        # float evaluation gets a wrong sign somewhere around the root
+        self.assertTrue(any(polynomial.eval(x) * (x - 2) < 0 for x in points))
+        self.assertEqual([sign(x) for x in points], [(x > 2) - (x < 2) for x in points])
+        self.assertGreater(counter["exact_evaluations"], 0)
+        self.assertEqual((sign(INF), sign(MINUS_INF), sign(3.0)), (1, -1, 1))
+        self.assertEqual(get_error_bound(polynomial.coefficients, 2.5), sign.get_error_bound(2.5))
+
+        counter = Counter()
+        sign = SignEvaluator(parse_to_polynomial("x^3-2*x-5"), counter)
+        self.assertEqual([sign(x) for x in [-10, 0, 2, 2.1, 3]], [-1, -1, -1, 1, 1])
+        self.assertEqual(counter, Counter())
@@ -0,0 +1,107 @@
+import unittest
+from math import sqrt, acos, cos, pi, copysign
+
+
+def cube_root(number):
+    return copysign(abs(number) ** (1 / 3), number)
+
+
+def solve_quadratic(a, b, c):
+    # Roots of a*x^2 + b*x + c in ascending order, a must not be 0. Rounding may split a double root into two close
+    # roots or into a pair of complex roots, solve_using_closed_form sorts that out.
+    # Reference: citardauq formula, https://en.wikipedia.org/wiki/Quadratic_formula#Square_root_in_the_denominator
+    discriminant = b * b - 4 * a * c
+    if discriminant == 0:
+        return [-b / (2 * a)]
+    if discriminant < 0:
+        return []
+
+    q = -(b + copysign(sqrt(discriminant), b)) / 2
+    return sorted([q / a, c / q])
+
+
+def solve_depressed_cubic(p, q):
+    # Roots of t^3 + p*t + q in ascending order.
+    # Reference: https://en.wikipedia.org/wiki/Cubic_equation#Trigonometric_and_hyperbolic_solutions
+    discriminant = (q / 2) ** 2 + (p / 3) ** 3
+    if discriminant == 0:
+        if p == 0:
+            return [0]
+        return sorted([3 * q / p, -3 * q / (2 * p)])
+
+    if discriminant > 0:
+        # Cardano, choosing the sign that avoids cancellation
+        u = cube_root(-q / 2 - copysign(sqrt(discriminant), q))
+        return [u - p / (3 * u)]
+
+    radius = 2 * sqrt(-p / 3)
+    angle = acos(max(-1, min(1, 3 * q / (2 * p) * sqrt(-3 / p))))
+    return sorted(radius * cos(angle / 3 - 2 * pi * k / 3) for k in range(3))
+
+
+def solve_cubic(a, b, c, d):
+    # Roots of a*x^3 + b*x^2 + c*x + d in ascending order, a must not be 0
+    b, c, d = b / a, c / a, d / a
+    p = c - b * b / 3
+    q = 2 * b ** 3 / 27 - b * c / 3 + d
+    return [t - b / 3 for t in solve_depressed_cubic(p, q)]
+
+
+def solve_quartic(a, b, c, d, e):
+    # Roots of a*x^4 + b*x^3 + c*x^2 + d*x + e in ascending order, a must not be 0.
+    # Reference: Ferrari's method, https://en.wikipedia.org/wiki/Quartic_function#Ferrari's_solution
+    b, c, d, e = b / a, c / a, d / a, e / a
+    p = c - 3 * b * b / 8
+    q = b ** 3 / 8 - b * c / 2 + d
+    r = -3 * b ** 4 / 256 + b * b * c / 16 - b * d / 4 + e
+
+    # the resolvent cubic always has a positive root when q != 0, unless q is lost in its rounding
+    m = max(solve_cubic(1, p, p * p / 4 - r, -q * q / 8)) if q != 0 else 0
+    if m > 0:
+        root_of_2m = sqrt(2 * m)
+        roots = solve_quadratic(1, -root_of_2m, p / 2 + m + q / (2 * root_of_2m)) +\
+            solve_quadratic(1, root_of_2m, p / 2 + m - q / (2 * root_of_2m))
+    else:
+        # biquadratic: y^4 + p*y^2 + r
+        roots = []
+        for z in solve_quadratic(1, p, r):
+            if z > 0:
+                roots.extend([-sqrt(z), sqrt(z)])
+            elif z == 0:
+                roots.append(0)
+
+    return sorted(y - b / 4 for y in roots)
+
+
+class Tests(unittest.TestCase):
+
+    def assertRootsAlmostEqual(self, roots, expected_roots):
+        self.assertEqual(len(roots), len(expected_roots))
+        for index in range(len(roots)):
+            self.assertAlmostEqual(roots[index], expected_roots[index], 9)
+
+    def test_solve_quadratic(self):
+        self.assertRootsAlmostEqual(solve_quadratic(1, 0, -1), [-1, 1])
+        self.assertRootsAlmostEqual(solve_quadratic(1, -2, 1), [1])
+        self.assertRootsAlmostEqual(solve_quadratic(6, 11, 6), [])
+        self.assertRootsAlmostEqual(solve_quadratic(1, 2.5, 1.5), [-1.5, -1])
+        self.assertRootsAlmostEqual(solve_quadratic(2, 0, 0), [0])
+        self.assertRootsAlmostEqual(solve_quadratic(1, -1e8, 1), [1e-8, 1e8])
+
+    def test_solve_cubic(self):
+        self.assertRootsAlmostEqual(solve_cubic(1, 6, 11, 6), [-3, -2, -1])
+        # rounding splits the double root -1 of (x+1)^2*(x+2), solve_using_closed_form merges the pair back
+        roots = solve_cubic(1, 4, 5, 2)
+        self.assertEqual(len(roots), 3)
+        for root, expected_root in zip(roots, [-2, -1, -1]):
+            self.assertAlmostEqual(root, expected_root, delta=1e-7)
+        self.assertRootsAlmostEqual(solve_cubic(1, -3, 3, -1), [1])
+        self.assertRootsAlmostEqual(solve_cubic(1, -3, 2, -10), [3.308907319765])
+        self.assertRootsAlmostEqual(solve_cubic(1 / 3, 0, -1, 0), [-sqrt(3), 0, sqrt(3)])
+
+    def test_solve_quartic(self):
+        self.assertRootsAlmostEqual(solve_quartic(1, 0, -5, 0, 4), [-2, -1, 1, 2])
+        self.assertRootsAlmostEqual(solve_quartic(1, 0, -4, 20, -7), [-3.278844683178, 0.377483540134])
+        self.assertRootsAlmostEqual(solve_quartic(1, -10, 35, -50, 24), [1, 2, 3, 4])
+        self.assertRootsAlmostEqual(solve_quartic(1, 0, 0, 0, 1), [])
+        self.assertRootsAlmostEqual(solve_quartic(1, 0, -2, 0, 1), [-1, 1])
@@ -2,9 +2,9 @@ import unittest
 
 from typing import List
 
-from convert_to_token_list import convert_to_token_list
+from convert_to_token_list import convert_to_token_list, Token, TokenKind
 from error import ExpressionSyntaxError
-from util import peek, is_operator, is_opening_bracket, is_closing_bracket, is_operand
+from util import peek
 
 
 def get_precedence(operator):
@@ -49,34 +49,37 @@ def get_corresponding_opening_bracket(closing_bracket):
         raise ExpressionSyntaxError("Not supported closing bracket: " + closing_bracket)
 
 
-def convert_infix_to_postfix(token_list: List[str]):
+def convert_infix_to_postfix(token_list: List[Token]):
     # Reference: https://www.geeksforgeeks.org/stack-set-2-infix-to-postfix/
     result = []
     operator_stack = []
     for token in token_list:
-        if is_operand(token):
+        if token.is_operand():
             result.append(token)
-        elif is_opening_bracket(token):
+        elif token.kind is TokenKind.OPENING_BRACKET:
             operator_stack.append(token)
-        elif is_closing_bracket(token):
-            while len(operator_stack) > 0 and peek(operator_stack) != get_corresponding_opening_bracket(token):
+        elif token.kind is TokenKind.CLOSING_BRACKET:
+            opening_bracket = get_corresponding_opening_bracket(token.text)
+            while len(operator_stack) > 0 and peek(operator_stack).text != opening_bracket:
                 result.append(operator_stack.pop())
             # discard opening bracket
             if len(operator_stack) > 0:
                 operator_stack.pop()
             else:
-                raise ExpressionSyntaxError("Cannot find corresponding opening bracket of: " + token)
-        elif is_operator(token):
-            while len(operator_stack) > 0 and is_operator(peek(operator_stack)) and\
-                    (get_precedence(token) < get_precedence(peek(operator_stack))
-                     or get_precedence(token) == get_precedence(peek(operator_stack)) and is_left_associative(token)):
+                raise ExpressionSyntaxError("Cannot find corresponding opening bracket of: " + token.text)
+        elif token.is_operator():
+            precedence = get_precedence(token.text)
+            left_associative = is_left_associative(token.text)
+            while len(operator_stack) > 0 and peek(operator_stack).is_operator() and\
+                    (precedence < get_precedence(peek(operator_stack).text)
+                     or precedence == get_precedence(peek(operator_stack).text) and left_associative):
                 result.append(operator_stack.pop())
             operator_stack.append(token)
         else:
-            raise ExpressionSyntaxError("Token is not supported: " + token)
+            raise ExpressionSyntaxError("Token is not supported: " + token.text)
 
     while len(operator_stack) > 0:
-        if is_operator(peek(operator_stack)):
+        if peek(operator_stack).is_operator():
             result.append(operator_stack.pop())
         else:
             raise ExpressionSyntaxError("Invalid expression")
@@ -89,11 +92,8 @@ def convert_infix_to_postfix_testing_wrapper(expression):
     postfix_list = convert_infix_to_postfix(token_list)
     if len(postfix_list) == 0:
         return "0"
-    
-    result = ""
-    for item in postfix_list:
-        result += " " + item
-    return result[1:]
+
+    return " ".join(token.text for token in postfix_list)
 
 
 class Test(unittest.TestCase):
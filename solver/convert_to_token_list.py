@@ -1,46 +1,115 @@
+import re
 import unittest
+from enum import Enum
+from typing import NamedTuple, Optional
 
-from util import peek, check_is_a_number, is_operator, is_opening_bracket
 
+class TokenKind(Enum):
+    NUMBER = 0
+    VARIABLE = 1
+    UNARY_OPERATOR = 2
+    BINARY_OPERATOR = 3
+    OPENING_BRACKET = 4
+    CLOSING_BRACKET = 5
+    UNKNOWN = 6
 
-def convert_to_token_list(expression):
-    # TODO: consider handling sign +/-
+
+class Token(NamedTuple):
+    kind: TokenKind
+    text: str
+    # offset of the token in the expression, the numeric value is only set for numbers
+    offset: int
+    value: Optional[float] = None
+
+    def is_operand(self):
+        return self.kind is TokenKind.NUMBER or self.kind is TokenKind.VARIABLE
+
+    def is_operator(self):
+        return self.kind is TokenKind.BINARY_OPERATOR or self.kind is TokenKind.UNARY_OPERATOR
+
+
+TOKEN_PATTERN = re.compile(r"(?P<number>[0-9]+\.?[0-9]*|\.[0-9]+)|(?P<symbol>.)", re.DOTALL)
+
+SYMBOL_KINDS = {
+    "x": TokenKind.VARIABLE,
+    "+": TokenKind.BINARY_OPERATOR,
+    "-": TokenKind.BINARY_OPERATOR,
+    "*": TokenKind.BINARY_OPERATOR,
+    "/": TokenKind.BINARY_OPERATOR,
+    "^": TokenKind.BINARY_OPERATOR,
+    "(": TokenKind.OPENING_BRACKET,
+    "[": TokenKind.OPENING_BRACKET,
+    "{": TokenKind.OPENING_BRACKET,
+    ")": TokenKind.CLOSING_BRACKET,
+    "]": TokenKind.CLOSING_BRACKET,
+    "}": TokenKind.CLOSING_BRACKET,
+}
+
+UNARY_OPERATORS = {"-": "neg", "+": "pos"}
+
+# a + or - following one of these (or at the start of the expression) is a sign, not a binary operator
+KINDS_BEFORE_UNARY_OPERATOR = (TokenKind.OPENING_BRACKET, TokenKind.BINARY_OPERATOR, TokenKind.UNARY_OPERATOR)
+
+
+def tokenize(expression):
+    # Single pass over the expression: numbers are parsed as they are matched and - / + signs are turned into the
+    # neg / pos operators on the fly
     result = []
-    for i in range(len(expression)):
-        character = expression[i]
-        if check_is_part_of_number(character) and len(result) > 0:
-            last_token = peek(result)
-            if check_is_a_number(last_token):
-                result[len(result) - 1] = last_token + character
-            else:
-                result.append(character)
+    previous_kind = TokenKind.OPENING_BRACKET
+    for match in TOKEN_PATTERN.finditer(expression):
+        text = match.group()
+        if match.lastgroup == "number":
+            token = Token(TokenKind.NUMBER, text, match.start(), float(text))
         else:
-            result.append(character)
-
-    # replace - sign with neg operator
-    for i in range(len(result)):
-        if i == 0 or i > 0 and (is_opening_bracket(result[i-1]) or is_operator(result[i-1])):
-            if result[i] == "-":
-                result[i] = "neg"
-            elif result[i] == "+":
-                result[i] = "pos"
+            kind = SYMBOL_KINDS.get(text, TokenKind.UNKNOWN)
+            if text in UNARY_OPERATORS and previous_kind in KINDS_BEFORE_UNARY_OPERATOR:
+                token = Token(TokenKind.UNARY_OPERATOR, UNARY_OPERATORS[text], match.start())
+            else:
+                token = Token(kind, text, match.start())
+        previous_kind = token.kind
+        result.append(token)
 
     return result
 
 
-def check_is_part_of_number(character):
-    return character in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
+def convert_to_token_list(expression):
+    # the tokens convert_infix_to_postfix takes, see tokenize
+    return tokenize(expression)
+
+
+def get_texts(token_list):
+    return [token.text for token in token_list]
 
 
 class Tests(unittest.TestCase):
 
     def test_convert_to_token_list(self):
-        self.assertEqual(convert_to_token_list("x"), ["x"])
-        self.assertEqual(convert_to_token_list("x+1"), ["x", "+", "1"])
-        self.assertEqual(convert_to_token_list("x+10"), ["x", "+", "10"])
-        self.assertEqual(convert_to_token_list("x^2+10"), ["x", "^", "2", "+", "10"])
-        self.assertEqual(convert_to_token_list("1.2*x^2+10"), ["1.2", "*", "x", "^", "2", "+", "10"])
-        self.assertEqual(convert_to_token_list("1.25*x^2+100"), ["1.25", "*", "x", "^", "2", "+", "100"])
-        self.assertEqual(convert_to_token_list("-x+10"), ["neg", "x", "+", "10"])
-        self.assertEqual(convert_to_token_list("+x+10"), ["pos", "x", "+", "10"])
-        self.assertEqual(convert_to_token_list("-x^2+1"), ["neg", "x", "^", "2", "+", "1"])
+        self.assertEqual(get_texts(convert_to_token_list("x")), ["x"])
+        self.assertEqual(get_texts(convert_to_token_list("x+1")), ["x", "+", "1"])
+        self.assertEqual(get_texts(convert_to_token_list("x+10")), ["x", "+", "10"])
+        self.assertEqual(get_texts(convert_to_token_list("x^2+10")), ["x", "^", "2", "+", "10"])
+        self.assertEqual(get_texts(convert_to_token_list("1.2*x^2+10")), ["1.2", "*", "x", "^", "2", "+", "10"])
+        self.assertEqual(get_texts(convert_to_token_list("1.25*x^2+100")), ["1.25", "*", "x", "^", "2", "+", "100"])
+        self.assertEqual(get_texts(convert_to_token_list("-x+10")), ["neg", "x", "+", "10"])
+        self.assertEqual(get_texts(convert_to_token_list("+x+10")), ["pos", "x", "+", "10"])
+        self.assertEqual(get_texts(convert_to_token_list("-x^2+1")), ["neg", "x", "^", "2", "+", "1"])
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("1.25*x^2"), [
+            Token(TokenKind.NUMBER, "1.25", 0, 1.25),
+            Token(TokenKind.BINARY_OPERATOR, "*", 4),
+            Token(TokenKind.VARIABLE, "x", 5),
+            Token(TokenKind.BINARY_OPERATOR, "^", 6),
+            Token(TokenKind.NUMBER, "2", 7, 2),
+        ])
+        self.assertEqual(tokenize("(-x)*-.5"), [
+            Token(TokenKind.OPENING_BRACKET, "(", 0),
+            Token(TokenKind.UNARY_OPERATOR, "neg", 1),
+            Token(TokenKind.VARIABLE, "x", 2),
+            Token(TokenKind.CLOSING_BRACKET, ")", 3),
+            Token(TokenKind.BINARY_OPERATOR, "*", 4),
+            Token(TokenKind.UNARY_OPERATOR, "neg", 5),
+            Token(TokenKind.NUMBER, ".5", 6, 0.5),
+        ])
+        self.assertEqual(tokenize("x y")[1], Token(TokenKind.UNKNOWN, " ", 1))
+        self.assertEqual(len(tokenize("x+1" * 10000)), 30000)
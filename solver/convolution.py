@@ -0,0 +1,148 @@
+import unittest
+from math import comb
+
+# below this length Karatsuba's extra additions cost more than the multiplications they save
+KARATSUBA_THRESHOLD = 32
+
+# integers up to this magnitude are represented exactly by floats
+EXACT_FLOAT_LIMIT = 2 ** 53
+
+
+def is_integral(coefficients):
+    return all(coefficient.is_integer() for coefficient in coefficients)
+
+
+def to_float(number):
+    # Python integers can grow past the float range, those become infinite as a float product would have
+    try:
+        return float(number)
+    except OverflowError:
+        return float('inf') if number > 0 else float('-inf')
+
+
+def add_coefficients(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    result = list(a)
+    for degree, coefficient in enumerate(b):
+        result[degree] += coefficient
+    return result
+
+
+def convolve(a, b):
+    # Schoolbook product of two coefficient sequences in ascending order of degree
+    result = [0] * (len(a) + len(b) - 1)
+    for d1, c1 in enumerate(a):
+        if c1 == 0:
+            continue
+        for d2, c2 in enumerate(b):
+            result[d1 + d2] += c1 * c2
+    return result
+
+
+def karatsuba(a, b):
+    # Reference: https://en.wikipedia.org/wiki/Karatsuba_algorithm
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < KARATSUBA_THRESHOLD:
+        return convolve(a, b)
+
+    half = len(a) // 2
+    a0, a1 = a[:half], a[half:]
+    result = [0] * (len(a) + len(b) - 1)
+    if len(b) <= half:
+        # unbalanced operands, only the longer one is split
+        for degree, coefficient in enumerate(karatsuba(a0, b)):
+            result[degree] += coefficient
+        for degree, coefficient in enumerate(karatsuba(a1, b)):
+            result[degree + half] += coefficient
+        return result
+
+    b0, b1 = b[:half], b[half:]
+    z0 = karatsuba(a0, b0)
+    z2 = karatsuba(a1, b1)
+    z1 = karatsuba(add_coefficients(a0, a1), add_coefficients(b0, b1))
+    for degree, coefficient in enumerate(z0):
+        result[degree] += coefficient
+        z1[degree] -= coefficient
+    for degree, coefficient in enumerate(z2):
+        result[degree + 2 * half] += coefficient
+        z1[degree] -= coefficient
+    for degree, coefficient in enumerate(z1):
+        if degree + half < len(result):
+            result[degree + half] += coefficient
+    return result
+
+
+def multiply_coefficients(a, b):
+    # Product of two coefficient sequences. Integral coefficients are multiplied as Python integers so the result is
+    # exact however large it grows, it is only rounded once when converted back to floats.
+    length = min(len(a), len(b))
+    if length < KARATSUBA_THRESHOLD and max(map(abs, a)) * max(map(abs, b)) * length < EXACT_FLOAT_LIMIT:
+        # every partial sum stays below 2^53, so integral coefficients are already multiplied exactly as floats
+        return convolve(a, b)
+    if is_integral(a) and is_integral(b):
+        return [to_float(coefficient) for coefficient in karatsuba([int(c) for c in a], [int(c) for c in b])]
+    return karatsuba(a, b)
+
+
+def power_coefficients(a, exponent):
+    # a^exponent for a coefficient sequence with trailing zeros trimmed, exponent >= 0
+    terms = [(degree, coefficient) for degree, coefficient in enumerate(a) if coefficient != 0]
+    integral = is_integral(a)
+    if integral:
+        terms = [(degree, int(coefficient)) for degree, coefficient in terms]
+
+    if exponent == 0:
+        return [1.0]
+    if len(terms) == 1:
+        [(degree, coefficient)] = terms
+        try:
+            coefficient = to_float(coefficient ** exponent)
+        except OverflowError:
+            coefficient = float('-inf') if coefficient < 0 and exponent % 2 == 1 else float('inf')
+        return [0.0] * (degree * exponent) + [coefficient]
+    if len(terms) == 2 and integral:
+        # binomial theorem: (a x^i + b x^j)^n = sum of C(n, k) a^(n-k) b^k x^(i(n-k)+jk)
+        [(i, a_i), (j, b_j)] = terms
+        result = [0] * (max(i, j) * exponent + 1)
+        for k in range(exponent + 1):
+            result[i * (exponent - k) + j * k] = comb(exponent, k) * a_i ** (exponent - k) * b_j ** k
+        return [to_float(coefficient) for coefficient in result]
+
+    # exponentiation by squaring
+    base = [int(coefficient) for coefficient in a] if integral else list(a)
+    result = [1]
+    while exponent > 0:
+        if exponent & 1:
+            result = karatsuba(result, base)
+        exponent >>= 1
+        if exponent > 0:
+            base = karatsuba(base, base)
+    return [to_float(coefficient) for coefficient in result]
+
+
+class Tests(unittest.TestCase):
+
+    def test_karatsuba(self):
+        for length_a, length_b in [(1, 1), (40, 40), (100, 37), (33, 200), (64, 64), (129, 70)]:
+            a = [(7 * degree) % 11 - 5 for degree in range(length_a)]
+            b = [(3 * degree) % 13 - 6 for degree in range(length_b)]
+            self.assertEqual(karatsuba(a, b), convolve(a, b))
+
+    def test_multiply_coefficients(self):
+        self.assertEqual(multiply_coefficients([1.0, 1.0], [-1.0, 1.0]), [-1.0, 0.0, 1.0])
+        self.assertEqual(multiply_coefficients([0.5, 1.0], [2.0]), [1.0, 2.0])
+        large = [float(2 ** 40 + 1)] * 40
+        self.assertEqual(multiply_coefficients(large, large)[39], float(40 * (2 ** 40 + 1) ** 2))
+
+    def test_power_coefficients(self):
+        self.assertEqual(power_coefficients([1.0, 1.0], 0), [1.0])
+        self.assertEqual(power_coefficients([1.0, 1.0], 3), [1.0, 3.0, 3.0, 1.0])
+        self.assertEqual(power_coefficients([0.0, 2.0], 3), [0.0, 0.0, 0.0, 8.0])
+        self.assertEqual(power_coefficients([-3.0, 0.0, 2.0], 2), [9.0, 0.0, -12.0, 0.0, 4.0])
+        self.assertEqual(power_coefficients([1.0, 2.0, 1.0], 5), [float(comb(10, k)) for k in range(11)])
+        self.assertEqual(power_coefficients([0.5, 1.0], 2), [0.25, 1.0, 1.0])
+        self.assertEqual(power_coefficients([1.0, 1.0], 200)[100], float(comb(200, 100)))
+        self.assertEqual(power_coefficients([10.0, 1.0], 400)[0], float('inf'))
+        self.assertEqual(power_coefficients([0.0, -1.5], 2001)[2001], float('-inf'))
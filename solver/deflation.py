@@ -0,0 +1,124 @@
+import unittest
+from cmath import sqrt as complex_sqrt
+
+# relative size of a Laguerre step below which the iteration has converged
+LAGUERRE_TOLERANCE = 1e-15
+MAX_LAGUERRE_ITERATIONS = 80
+# fractional steps used every 10 iterations to break the rare limit cycles of Laguerre's method
+FRACTIONAL_STEPS = [0.5, 0.25, 0.75, 0.13, 0.38, 0.62, 0.88, 1.0]
+
+
+def eval_with_derivatives(coefficients, x):
+    # p(x), p'(x) and p''(x) by Horner's rule, coefficients in ascending order of degree
+    value = first = second = 0
+    for coefficient in reversed(coefficients):
+        second = second * x + first
+        first = first * x + value
+        value = value * x + coefficient
+    return value, first, 2 * second
+
+
+def laguerre(coefficients, x=0j):
+    # One root (possibly complex) of the polynomial, reached from x by Laguerre's method.
+    # Reference: Numerical Recipes 9.5
+    degree = len(coefficients) - 1
+    for iteration in range(1, MAX_LAGUERRE_ITERATIONS + 1):
+        value, first, second = eval_with_derivatives(coefficients, x)
+        if value == 0:
+            return x
+        g = first / value
+        h = g * g - second / value
+        root = complex_sqrt((degree - 1) * (degree * h - g * g))
+        denominator = g + root if abs(g + root) >= abs(g - root) else g - root
+        if denominator == 0:
+            step = (1 + abs(x)) * complex(0.6, 0.8)
+        else:
+            step = degree / denominator
+        if abs(step) <= LAGUERRE_TOLERANCE * abs(x):
+            return x - step
+        if iteration % 10 == 0:
+            x = x - FRACTIONAL_STEPS[(iteration // 10 - 1) % len(FRACTIONAL_STEPS)] * step
+        else:
+            x = x - step
+    return x
+
+
+def divide_by_linear(coefficients, root):
+    # Synthetic division by (x - root), the remainder is dropped
+    quotient = [0] * (len(coefficients) - 1)
+    remainder = coefficients[-1]
+    for degree in reversed(range(len(quotient))):
+        quotient[degree] = remainder
+        remainder = coefficients[degree] + remainder * root
+    return quotient
+
+
+def divide_by_quadratic(coefficients, p, q):
+    # Synthetic division by (x^2 + p*x + q), the remainder is dropped
+    quotient = [0] * (len(coefficients) - 2)
+    for degree in reversed(range(len(quotient))):
+        value = coefficients[degree + 2]
+        if degree + 1 < len(quotient):
+            value -= p * quotient[degree + 1]
+        if degree + 2 < len(quotient):
+            value -= q * quotient[degree + 2]
+        quotient[degree] = value
+    return quotient
+
+
+def find_all_roots(coefficients, is_real):
+    # All roots of a polynomial with real coefficients (ascending order of degree, non-zero leading coefficient).
+    # Roots are found one at a time, starting from the smallest in modulus, and divided out of the polynomial, a
+    # complex root together with its conjugate. is_real(z) decides whether a root found is a real root.
+    roots = []
+    coefficients = list(coefficients)
+    while len(coefficients) > 1:
+        if coefficients[0] == 0:
+            roots.append(0j)
+            coefficients = coefficients[1:]
+            continue
+        if len(coefficients) == 2:
+            roots.append(complex(-coefficients[0] / coefficients[1]))
+            break
+
+        root = laguerre(coefficients)
+        if is_real(root):
+            root = complex(root.real)
+            roots.append(root)
+            coefficients = divide_by_linear(coefficients, root.real)
+        else:
+            roots.extend([root, root.conjugate()])
+            coefficients = divide_by_quadratic(coefficients, -2 * root.real, abs(root) ** 2)
+
+    return roots
+
+
+class Tests(unittest.TestCase):
+
+    def test_eval_with_derivatives(self):
+        # x^3 - 2x + 1 at 2
+        self.assertEqual(eval_with_derivatives([1, -2, 0, 1], 2), (5, 10, 12))
+
+    def test_divide(self):
+        # (x^3 - 6x^2 + 11x - 6) / (x - 1) = x^2 - 5x + 6
+        self.assertEqual(divide_by_linear([-6, 11, -6, 1], 1), [6, -5, 1])
+        # (x^4 - 1) / (x^2 + 1) = x^2 - 1
+        self.assertEqual(divide_by_quadratic([-1, 0, 0, 0, 1], 0, 1), [-1, 0, 1])
+        # (x^3 + 2x^2 + 2x + 1) / (x^2 + x + 1) = x + 1
+        self.assertEqual(divide_by_quadratic([1, 2, 2, 1], 1, 1), [1, 1])
+
+    def test_find_all_roots(self):
+        def is_real(z):
+            return abs(z.imag) <= 1e-9
+
+        roots = sorted(find_all_roots([-6, 11, -6, 1], is_real), key=lambda z: z.real)
+        for index, expected_root in enumerate([1, 2, 3]):
+            self.assertAlmostEqual(roots[index], expected_root, 9)
+
+        roots = find_all_roots([1, 0, 0, 0, 0, 0, 1], is_real)
+        self.assertEqual(len(roots), 6)
+        for root in roots:
+            self.assertAlmostEqual(root ** 6, -1, 9)
+
+        roots = find_all_roots([0, 0, 1, 1], is_real)
+        self.assertEqual(sorted(root.real for root in roots), [-1, 0, 0])
@@ -0,0 +1,130 @@
+import threading
+import time
+import unittest
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from polynomial import Polynomial, parse_to_polynomial
+
+# statistics of the innermost instrument() block of the current thread or task, None when instrumentation is off
+active_statistics = ContextVar("active_statistics", default=None)
+
+# Polynomial.eval and compile are only replaced by counting versions while some instrument() block is open, so
+# evaluations cost nothing extra the rest of the time
+original_eval = Polynomial.eval
+original_compile = Polynomial.compile
+open_blocks = 0
+open_blocks_lock = threading.Lock()
+
+# counter entry holding the current derivative recursion depth, only its maximum is reported
+DEPTH = "depth"
+
+
+def counting_eval(self, x):
+    statistics = active_statistics.get()
+    if statistics is not None:
+        statistics.counter["eval_calls"] += 1
+    return original_eval(self, x)
+
+
+def counting_compile(self):
+    evaluate = original_compile(self)
+
+    def counting_evaluate(x):
+        statistics = active_statistics.get()
+        if statistics is not None:
+            statistics.counter["eval_calls"] += 1
+        return evaluate(x)
+
+    return counting_evaluate
+
+
+class SolveStatistics:
+    # Counters (evaluations, iterations, recursion depth...) filled by the solver and wall time spent per stage
+    def __init__(self):
+        self.counter = Counter()
+        self.timings = Counter()
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] += time.perf_counter() - start
+
+    def as_dict(self):
+        counters = {name: count for name, count in self.counter.items() if name != DEPTH}
+        return {"counters": counters, "timings": dict(self.timings)}
+
+
+@contextmanager
+def instrument():
+    # with instrument() as statistics: ... collects what every solve inside the block does
+    global open_blocks
+    statistics = SolveStatistics()
+    token = active_statistics.set(statistics)
+    with open_blocks_lock:
+        open_blocks += 1
+        Polynomial.eval = counting_eval
+        Polynomial.compile = counting_compile
+    try:
+        yield statistics
+    finally:
+        active_statistics.reset(token)
+        with open_blocks_lock:
+            open_blocks -= 1
+            if open_blocks == 0:
+                Polynomial.eval = original_eval
+                Polynomial.compile = original_compile
+
+
+def get_active_counter():
+    statistics = active_statistics.get()
+    return None if statistics is None else statistics.counter
+
+
+def measure_stage(stage):
+    statistics = active_statistics.get()
+    return nullcontext() if statistics is None else statistics.measure(stage)
+
+
+@contextmanager
+def count_depth(counter):
+    # counter["max_depth"] keeps the deepest nesting of count_depth blocks sharing this counter, if any
+    if counter is None:
+        yield
+        return
+    counter[DEPTH] += 1
+    counter["max_depth"] = max(counter["max_depth"], counter[DEPTH])
+    try:
+        yield
+    finally:
+        counter[DEPTH] -= 1
+
+
+class Tests(unittest.TestCase):
+
+    def test_instrument(self):
+        polynomial = parse_to_polynomial("x^2-2")
+        with instrument() as statistics:
+            polynomial.eval(1)
+            with measure_stage("stage"):
+                polynomial.compile()(2)
+            with count_depth(get_active_counter()):
+                with count_depth(get_active_counter()):
+                    pass
+        polynomial.eval(3)
+
+        self.assertIs(Polynomial.eval, original_eval)
+        self.assertIs(Polynomial.compile, original_compile)
+        result = statistics.as_dict()
+        self.assertEqual(result["counters"], {"eval_calls": 2, "max_depth": 2})
+        self.assertEqual(list(result["timings"]), ["stage"])
+
+    def test_disabled(self):
+        self.assertIsNone(get_active_counter())
+        self.assertIsInstance(measure_stage("stage"), nullcontext)
+        with count_depth(None):
+            pass
@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+import unittest
+from collections import OrderedDict
+
+from error import ExpressionSyntaxError
+from polynomial import parse_to_polynomial, Polynomial
+
+WHITESPACE = re.compile(r"\s+")
+# removing whitespace between two of these would join two numbers into one
+NUMBER_CHARACTERS = "0123456789."
+
+
+def normalize_expression(expression):
+    # Whitespace is dropped wherever it only separates tokens. Between two numbers it is kept as a single space, so
+    # that "1 2*x" is rejected by the parser as it is without the cache instead of being read as 12*x.
+    def replace(match):
+        start, end = match.span()
+        if 0 < start and end < len(expression) and expression[start - 1] in NUMBER_CHARACTERS and \
+                expression[end] in NUMBER_CHARACTERS:
+            return " "
+        return ""
+
+    return WHITESPACE.sub(replace, expression)
+
+
+class ParseCache:
+    # Least recently used cache in front of parse_to_polynomial, optionally expiring entries ttl seconds after they
+    # were parsed. Polynomials are immutable, so every lookup of an expression returns the same instance.
+    def __init__(self, max_size=1024, ttl=None, timer=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timer = timer
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, expression):
+        key = normalize_expression(expression)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                polynomial, expires_at = entry
+                if expires_at is None or self.timer() < expires_at:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return polynomial
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+
+        # parsing happens outside the lock, two threads missing on the same key both parse it and the last one wins
+        polynomial = parse_to_polynomial(key)
+        expires_at = None if self.ttl is None else self.timer() + self.ttl
+        with self.lock:
+            self.entries[key] = (polynomial, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return polynomial
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_statistics(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+parse_cache = ParseCache()
+
+
+def parse_to_polynomial_cached(expression):
+    return parse_cache.parse(expression)
+
+
+class Tests(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = ParseCache()
+        self.assertEqual(cache.parse("x^2-1"), parse_to_polynomial("x^2-1"))
+        self.assertEqual(cache.parse(" x^2 - 1 "), parse_to_polynomial("x^2-1"))
+        self.assertEqual(cache.parse("x+1"), parse_to_polynomial("x+1"))
+        statistics = cache.get_statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"], statistics["size"]), (1, 2, 2))
+
+    def test_whitespace_inside_numbers(self):
+        cache = ParseCache()
+        cache.parse("12*x-24")
+        cache.parse("x^10-1")
+        for expression in ["1 2*x-24", "x^1 0-1", "x^1. 5", "1\t.5*x"]:
+            with self.assertRaises(ExpressionSyntaxError):
+                parse_to_polynomial(expression)
+            with self.assertRaises(ExpressionSyntaxError):
+                cache.parse(expression)
+        self.assertEqual(cache.get_statistics()["hits"], 0)
+        self.assertEqual(normalize_expression(" 1 2 * x ^ 3 . 5 "), "1 2*x^3 . 5")
+
+    def test_returned_polynomial_is_shared(self):
+        cache = ParseCache()
+        polynomial = cache.parse("x^2-1")
+        polynomial.minus(parse_to_polynomial("x^2"))
+        self.assertIs(cache.parse("x^2 - 1"), polynomial)
+        self.assertEqual(polynomial, Polynomial({2: 1, 0: -1}))
+
+    def test_eviction(self):
+        cache = ParseCache(max_size=2)
+        cache.parse("x")
+        cache.parse("x+1")
+        cache.parse("x")
+        cache.parse("x+2")
+        self.assertEqual(list(cache.entries), ["x", "x+2"])
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+
+    def test_ttl(self):
+        now = [0]
+        cache = ParseCache(ttl=10, timer=lambda: now[0])
+        cache.parse("x")
+        now[0] = 5
+        cache.parse("x")
+        now[0] = 11
+        cache.parse("x")
+        statistics = cache.get_statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"], statistics["evictions"]), (1, 2, 1))
+
+    def test_threads(self):
+        cache = ParseCache(max_size=8)
+        expressions = ["x^{}-1".format(degree) for degree in range(16)]
+
+        def work():
+            for expression in expressions * 10:
+                self.assertEqual(cache.parse(expression), parse_to_polynomial(expression))
+
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        statistics = cache.get_statistics()
+        self.assertEqual(statistics["hits"] + statistics["misses"], 4 * 10 * 16)
+        self.assertLessEqual(statistics["size"], 8)
@@ -1,50 +1,132 @@
 import copy
+import pickle
 import unittest
+from array import array
+from math import comb
+from operator import add, sub
 from typing import List
 
 from error import EvaluationError, ExpressionSyntaxError
-from convert_to_postfix import convert_infix_to_postfix
-from convert_to_token_list import convert_to_token_list
-from util import check_is_a_number, is_unary_operator, is_operand, is_binary_operator
-
-
-def parse_operand(operand: str):
-    if operand == 'x':
-        dictionary = {1: 1}
+from convert_to_postfix import convert_infix_to_postfix, get_precedence, is_right_associative,\
+    get_corresponding_opening_bracket
+from convert_to_token_list import tokenize, Token, TokenKind
+from convolution import multiply_coefficients, power_coefficients
+from util import check_is_a_number
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INF = float('inf')
+MINUS_INF = float('-inf')
+
+PRATT = "pratt"
+# the original tokens -> postfix -> polynomial pipeline, kept as a reference implementation
+POSTFIX = "postfix"
+
+# the Fujiwara and Lagrange bounds may be attained by a root, they are widened by this factor so that every root lies
+# strictly inside the bound
+ROOT_BOUND_MARGIN = 1.125
+
+
+def trim(coefficients):
+    # coefficients as a tuple without its trailing zeros
+    end = len(coefficients)
+    while end > 0 and coefficients[end - 1] == 0:
+        end -= 1
+    return tuple(coefficients[:end])
+
+
+def get_root_bound(coefficients):
+    # Bound on the modulus of every (complex) root, coefficients in ascending order of degree, the smallest of the
+    # Cauchy, Lagrange and Fujiwara bounds.
+    # Reference: https://en.wikipedia.org/wiki/Geometrical_properties_of_polynomial_roots#Bounds_on_(complex)_polynomial_roots
+    degree = len(coefficients) - 1
+    if degree < 1:
+        return 0.0
+    leading_coefficient = abs(coefficients[-1])
+    ratios = [abs(coefficient) / leading_coefficient for coefficient in coefficients[:-1]]
+
+    cauchy = 1 + max(ratios)
+    lagrange = max(1, sum(ratios))
+    fujiwara = 2 * max([(ratios[0] / 2) ** (1 / degree)] +
+                       [ratios[index] ** (1 / (degree - index)) for index in range(1, degree)])
+    if fujiwara == 0:
+        # x^n, every root is 0
+        return cauchy
+    return min(cauchy, ROOT_BOUND_MARGIN * min(lagrange, fujiwara))
+
+
+# Horner evaluators are generated once per degree and then bound to the coefficients of each polynomial, see compile
+evaluator_factories = {}
+
+
+def get_evaluator_factory(degree):
+    # make(c0, ..., cn) returns x -> (...(cn x + cn-1) x + ...) x + c0 as straight-line code, with the coefficients
+    # held in closure cells
+    factory = evaluator_factories.get(degree)
+    if factory is None:
+        lines = ["def make({}):".format(", ".join("c{}".format(d) for d in range(degree + 1))),
+                 "    def evaluate(x):",
+                 "        result = c{}".format(degree)]
+        for d in reversed(range(degree)):
+            lines.append("        result = result * x + c{}".format(d))
+        lines += ["        return result",
+                  "    return evaluate"]
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        factory = evaluator_factories[degree] = namespace["make"]
+    return factory
+
+
+def evaluate_zero(x):
+    return 0
+
+
+def parse_operand(operand: Token):
+    if operand.kind is TokenKind.VARIABLE:
+        return make_polynomial((0.0, 1.0))
+    return make_polynomial((float(operand.value),) if operand.value != 0 else ())
+
+
+def apply_unary_operator(operator, op1):
+    if operator == "neg":
+        return op1.neg()
+    elif operator == "pos":
+        return op1
     else:
-        dictionary = {0: float(operand)}
-    return Polynomial(dictionary)
+        raise ExpressionSyntaxError("Not supported operator: " + operator)
+
+
+def apply_binary_operator(operator, op1, op2):
+    if operator == "+":
+        return op1.plus(op2)
+    elif operator == "-":
+        return op1.minus(op2)
+    elif operator == "*":
+        return op1.multiply(op2)
+    elif operator == "/":
+        return op1.divide(op2)
+    elif operator == "^":
+        return op1.power(op2)
+    else:
+        raise ExpressionSyntaxError("Not supported operator: " + operator)
 
 
-def evaluate_postfix(token_list: List[str]):
+def evaluate_postfix(token_list: List[Token]):
     operand_stack = []
     for token in token_list:
-        if is_operand(token):
+        if token.is_operand():
             operand_stack.append(parse_operand(token))
         else:
-            if is_unary_operator(token) and len(operand_stack) >= 1:
+            if token.kind is TokenKind.UNARY_OPERATOR and len(operand_stack) >= 1:
                 op1 = operand_stack.pop()
-                if token == "neg":
-                    result = op1.neg()
-                elif token == "pos":
-                    result = op1
-                else:
-                    raise ExpressionSyntaxError("Not supported operator: " + token)
-            elif is_binary_operator(token) and len(operand_stack) >= 2:
+                result = apply_unary_operator(token.text, op1)
+            elif token.kind is TokenKind.BINARY_OPERATOR and len(operand_stack) >= 2:
                 op2 = operand_stack.pop()
                 op1 = operand_stack.pop()
-                if token == "+":
-                    result = op1.plus(op2)
-                elif token == "-":
-                    result = op1.minus(op2)
-                elif token == "*":
-                    result = op1.multiply(op2)
-                elif token == "/":
-                    result = op1.divide(op2)
-                elif token == "^":
-                    result = op1.power(op2)
-                else:
-                    raise ExpressionSyntaxError("Not supported operator: " + token)
+                result = apply_binary_operator(token.text, op1, op2)
             else:
                 raise ExpressionSyntaxError("Invalid expression")
 
@@ -55,40 +137,168 @@ def evaluate_postfix(token_list: List[str]):
         raise ExpressionSyntaxError("Invalid expression")
 
 
-def parse_to_polynomial(expression):
-    token_list = convert_to_token_list(expression)
-    postfix_token_list = convert_infix_to_postfix(token_list)
-    return evaluate_postfix(postfix_token_list).simplify()
+class PrattParser:
+    # Precedence climbing parser that builds the polynomial while reading the tokens, without the intermediate
+    # postfix list. It follows the precedence and associativity rules of convert_infix_to_postfix.
+    # Reference: https://en.wikipedia.org/wiki/Operator-precedence_parser#Precedence_climbing_method
+    def __init__(self, token_list: List[Token]):
+        self.token_list = token_list
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.token_list):
+            return self.token_list[self.position]
+        return None
+
+    def parse(self):
+        result = self.parse_expression(0)
+        token = self.peek()
+        if token is not None:
+            if token.kind is TokenKind.CLOSING_BRACKET:
+                raise ExpressionSyntaxError("Cannot find corresponding opening bracket of: " + token.text)
+            raise self.unexpected_token_error(token)
+        return result
+
+    @staticmethod
+    def unexpected_token_error(token):
+        if token is not None and token.kind is TokenKind.UNKNOWN:
+            return ExpressionSyntaxError("Token is not supported: " + token.text)
+        return ExpressionSyntaxError("Invalid expression")
+
+    def parse_expression(self, min_precedence):
+        result = self.parse_prefix()
+        token = self.peek()
+        while token is not None and token.kind is TokenKind.BINARY_OPERATOR:
+            precedence = get_precedence(token.text)
+            if precedence < min_precedence:
+                break
+            self.position += 1
+            op2 = self.parse_expression(precedence if is_right_associative(token.text) else precedence + 1)
+            result = apply_binary_operator(token.text, result, op2)
+            token = self.peek()
+
+        return result
+
+    def parse_prefix(self):
+        token = self.peek()
+        if token is None:
+            raise self.unexpected_token_error(token)
+        self.position += 1
+
+        if token.is_operand():
+            return parse_operand(token)
+        elif token.kind is TokenKind.UNARY_OPERATOR:
+            return apply_unary_operator(token.text, self.parse_expression(get_precedence(token.text)))
+        elif token.kind is TokenKind.OPENING_BRACKET:
+            result = self.parse_expression(0)
+            closing_bracket = self.peek()
+            if closing_bracket is None or closing_bracket.kind is not TokenKind.CLOSING_BRACKET:
+                raise self.unexpected_token_error(closing_bracket)
+            if get_corresponding_opening_bracket(closing_bracket.text) != token.text:
+                raise ExpressionSyntaxError("Cannot find corresponding opening bracket of: " + closing_bracket.text)
+            self.position += 1
+            return result
+        else:
+            raise self.unexpected_token_error(token)
+
+
+def parse_to_polynomial(expression, parser=PRATT):
+    token_list = tokenize(expression)
+    if parser == PRATT:
+        return PrattParser(token_list).parse()
+    elif parser == POSTFIX:
+        postfix_token_list = convert_infix_to_postfix(token_list)
+        return evaluate_postfix(postfix_token_list)
+    else:
+        raise ValueError("Not supported parser: " + str(parser))
 
 
 class Polynomial:
+    # Coefficients are stored densely in ascending order of degree, so that
+    # coefficients[degree] is the coefficient of x^degree. Trailing zeros are
+    # always trimmed, hence the zero polynomial has no coefficient at all.
+    # Instances are immutable: the coefficients are a tuple of floats and every
+    # operation returns a new polynomial, so that one instance can be shared
+    # between threads or used as a dict key. Only coefficients and degree are
+    # set on construction, hash, root_bound and evaluator are set on first use.
+    __slots__ = ("coefficients", "degree", "hash", "root_bound", "evaluator")
+
     def __init__(self, dictionary):
-        self.dictionary = dictionary
+        max_degree = -1
+        for degree in dictionary:
+            if dictionary[degree] != 0 and degree > max_degree:
+                max_degree = degree
+
+        coefficients = [0.0] * (max_degree + 1)
+        for degree, coefficient in dictionary.items():
+            if coefficient != 0:
+                coefficients[degree] = float(coefficient)
+        set_coefficients(self, tuple(coefficients))
+        set_degree(self, max(max_degree, 0))
+
+    @staticmethod
+    def from_coefficients(coefficients):
+        # coefficients are given in ascending order of degree, see __init__
+        return make_polynomial(trim(tuple(map(float, coefficients))))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Polynomial is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Polynomial is immutable")
+
+    def __reduce__(self):
+        # pickle and copy rebuild the polynomial from its coefficients, the cached values are not carried over
+        return Polynomial.from_coefficients, (self.coefficients,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def copy(self):
+        # polynomials are immutable, the same instance can be used everywhere
+        return self
+
+    @property
+    def dictionary(self):
+        return {degree: coefficient for degree, coefficient in enumerate(self.coefficients) if coefficient != 0}
 
     def __eq__(self, other):
         if isinstance(other, Polynomial):
-            return self.dictionary == other.dictionary
+            return self.coefficients == other.coefficients
         else:
             return False
 
+    def __hash__(self):
+        try:
+            return self.hash
+        except AttributeError:
+            set_hash(self, hash(self.coefficients))
+            return self.hash
+
     def __str__(self):
         result = ""
-        if len(self.dictionary) == 0:
+        if len(self.coefficients) == 0:
             return "0"
 
-        for degree in self.dictionary:
+        for degree in reversed(range(len(self.coefficients))):
+            coefficient = self.coefficients[degree]
+            if coefficient == 0:
+                continue
             if degree == 0:
-                result += "{} + ".format(self.get_coefficient(degree))
+                result += "{} + ".format(coefficient)
             elif degree == 1:
-                if self.get_coefficient(degree) == 1:
+                if coefficient == 1:
                     result += "x + "
                 else:
-                    result += "{}x + ".format(self.dictionary[degree])
+                    result += "{}x + ".format(coefficient)
             else:
-                if self.get_coefficient(degree) == 1:
+                if coefficient == 1:
                     result += "x^{} + ".format(degree)
                 else:
-                    result += "{}x^{} + ".format(self.get_coefficient(degree), degree)
+                    result += "{}x^{} + ".format(coefficient, degree)
 
         return result[0:len(result) - 3]
 
@@ -99,113 +309,134 @@ class Polynomial:
         if not isinstance(other, Polynomial):
             raise TypeError("Parameter is not a Polynomial")
 
-        for degree in other.dictionary:
-            self.dictionary[degree] = self.dictionary.get(degree, 0) + other.dictionary[degree]
-
-        return self.simplify()
+        a = self.coefficients
+        b = other.coefficients
+        if len(b) == 0:
+            return self
+        if len(a) == 0:
+            return other
+        if len(a) < len(b):
+            a, b = b, a
+        return make_polynomial(trim(tuple(map(add, a, b)) + a[len(b):]))
 
     def minus(self, other):
         if not isinstance(other, Polynomial):
             raise TypeError("Parameter is not a Polynomial")
 
-        for degree in other.dictionary:
-            self.dictionary[degree] = self.dictionary.get(degree, 0) - other.dictionary[degree]
-
-        return self.simplify()
+        a = self.coefficients
+        b = other.coefficients
+        if len(b) == 0:
+            return self
+        if len(a) >= len(b):
+            return make_polynomial(trim(tuple(map(sub, a, b)) + a[len(b):]))
+        return make_polynomial(tuple(map(sub, a, b)) + tuple(-coefficient for coefficient in b[len(a):]))
 
     def multiply(self, other):
         if not isinstance(other, Polynomial):
             raise TypeError("Parameter is not a Polynomial")
-        result = {}
-        for d1 in self.dictionary:
-            for d2 in other.dictionary:
-                result[d1 + d2] = result.get(d1 + d2, 0) + self.dictionary.get(d1) * other.dictionary.get(d2)
+        a = self.coefficients
+        b = other.coefficients
+        if len(a) == 0 or len(b) == 0:
+            return Polynomial({})
 
-        return Polynomial(result).simplify()
+        return Polynomial.from_coefficients(multiply_coefficients(a, b))
 
     def neg(self):
-        result = copy.deepcopy(self)
-        for degree in result.dictionary:
-            result.dictionary[degree] = -(result.dictionary[degree])
-        return result
+        return make_polynomial(tuple(-coefficient for coefficient in self.coefficients))
 
     @staticmethod
     def from_constant(number):
         return Polynomial({0: number})
 
     def simplify(self):
-        zero_coefficient = []
-        for degree in self.dictionary:
-            if self.dictionary[degree] == 0:
-                zero_coefficient.append(degree)
-        
-        for degree in zero_coefficient:
-            self.dictionary.pop(degree)
-
+        # the coefficients are trimmed on construction already
         return self
 
     def get_full_coefficient(self):
-        coefficients = []
-        max_degree = 0
-        for degree in self.dictionary:
-            if degree > max_degree:
-                max_degree = degree
-
-        for degree in reversed(range(0, max_degree + 1)):
-            coefficients.append(self.dictionary.get(degree, 0))
-
-        return coefficients
+        if len(self.coefficients) == 0:
+            return [0]
+        return list(reversed(self.coefficients))
 
     def derivative(self):
-        result = {}
-        for degree, coefficient in self.dictionary.items():
-            if degree >= 1:
-                result[degree - 1] = coefficient * degree
-
-        return Polynomial(result)
+        return Polynomial.from_coefficients(
+            degree * self.coefficients[degree] for degree in range(1, len(self.coefficients)))
 
     def eval(self, x):
-        if x == float('inf'):
+        if x == INF:
             return self.get_lim_at_inf()
-        if x == float('-inf'):
+        if x == MINUS_INF:
             return self.get_lim_at_minus_inf()
-        
+
+        # Horner's rule: a_n x^n + ... + a_0 = (...(a_n x + a_n-1) x + ...) x + a_0
         result = 0
-        for degree, coefficient in self.dictionary.items():
-            result += coefficient * x ** degree
+        for coefficient in reversed(self.coefficients):
+            result = result * x + coefficient
 
         return result
 
-    def get_highest_degree(self):
-        max_degree = 0
-        for degree in self.dictionary:
-            if degree > max_degree:
-                max_degree = degree
+    def compile(self):
+        # A function evaluating the polynomial at a finite x, several times faster than eval. It gives the same
+        # results as eval, and is generated on first use.
+        try:
+            return self.evaluator
+        except AttributeError:
+            if len(self.coefficients) == 0:
+                set_evaluator(self, evaluate_zero)
+            else:
+                set_evaluator(self, get_evaluator_factory(self.degree)(*self.coefficients))
+            return self.evaluator
+
+    def eval_many(self, xs):
+        # Evaluate at every point of xs in one pass. With NumPy available xs may be any array-like or buffer and
+        # an ndarray is returned, otherwise an array('d') is returned.
+        if numpy is None:
+            return array('d', map(self.eval, xs))
+
+        xs = numpy.asarray(xs, dtype=numpy.float64)
+        result = numpy.zeros_like(xs)
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            for coefficient in reversed(self.coefficients):
+                result *= xs
+                result += coefficient
+        result = numpy.where(xs == INF, self.get_lim_at_inf(), result)
+        return numpy.where(xs == MINUS_INF, self.get_lim_at_minus_inf(), result)
 
-        return max_degree
+    def get_highest_degree(self):
+        return self.degree
 
     def get_coefficient(self, degree):
-        return self.dictionary.get(degree, 0)
-    
+        if degree < len(self.coefficients):
+            return self.coefficients[degree]
+        return 0
+
+    def get_leading_coefficient(self):
+        return self.get_coefficient(self.degree)
+
+    def get_root_bound(self):
+        # every root x satisfies |x| < bound, computed on first use
+        try:
+            return self.root_bound
+        except AttributeError:
+            set_root_bound(self, get_root_bound(self.coefficients))
+            return self.root_bound
+
     def get_lim_at_inf(self):
-        highest_degree = self.get_highest_degree()
-        if self.dictionary[highest_degree] > 0:
-            return float('inf')
+        if self.get_leading_coefficient() > 0:
+            return INF
         else:
-            return float('-inf')
+            return MINUS_INF
 
     def get_lim_at_minus_inf(self):
-        highest_degree = self.get_highest_degree()
-        if highest_degree % 2 == 0:
-            if self.dictionary[highest_degree] > 0:
-                return float('inf')
+        if self.degree % 2 == 0:
+            if self.get_leading_coefficient() > 0:
+                return INF
             else:
-                return float('-inf')
+                return MINUS_INF
         else:
-            if self.dictionary[highest_degree] > 0:
-                return float('-inf')
+            if self.get_leading_coefficient() > 0:
+                return MINUS_INF
             else:
-                return float('inf')
+                return INF
 
     def divide(self, op2):
         if isinstance(op2, Polynomial) and op2.is_constant():
@@ -217,14 +448,10 @@ class Polynomial:
 
         if denominator == 0:
             raise EvaluationError("Divided by zero")
-        result = copy.deepcopy(self)
-        for degree in range(result.get_highest_degree() + 1):
-            if result.get_coefficient(degree) != 0:
-                result.dictionary[degree] = result.get_coefficient(degree) / denominator
-        return result
+        return Polynomial.from_coefficients(coefficient / denominator for coefficient in self.coefficients)
 
     def is_constant(self):
-        return self.get_highest_degree() == 0
+        return self.degree == 0
 
     def power(self, op2):
         if isinstance(op2, Polynomial) and op2.is_constant():
@@ -236,16 +463,29 @@ class Polynomial:
         if int(degree) == degree:
             degree = int(degree)
             if degree >= 0:
-                result = Polynomial({0: 1})
-                for i in range(degree):
-                    result = result.multiply(self)
-                return result
+                return Polynomial.from_coefficients(power_coefficients(self.coefficients, degree))
             else:
                 raise EvaluationError("Negative power is not supported: " + str(degree))
         else:
             raise EvaluationError("Not integer power is not supported: " + str(degree))
 
 
+# Polynomial forbids setting attributes, its slots are written through their descriptors instead
+set_coefficients = Polynomial.coefficients.__set__
+set_degree = Polynomial.degree.__set__
+set_hash = Polynomial.hash.__set__
+set_root_bound = Polynomial.root_bound.__set__
+set_evaluator = Polynomial.evaluator.__set__
+
+
+def make_polynomial(coefficients):
+    # coefficients is a tuple of floats without trailing zeros, see Polynomial
+    polynomial = object.__new__(Polynomial)
+    set_coefficients(polynomial, coefficients)
+    set_degree(polynomial, max(len(coefficients) - 1, 0))
+    return polynomial
+
+
 class Tests(unittest.TestCase):
 
     def test_parse(self):
@@ -312,6 +552,17 @@ class Tests(unittest.TestCase):
         expression = "(x+2*(x+1))^2+1"
         self.assertEqual(parse_to_polynomial(expression), parse_to_polynomial("9*x^2+12*x+5"))
 
+    def test_parse_with_postfix_as_reference(self):
+        for expression in ["1", "-x", "--x", "-+x", "(-x)^2", "-x^2", "-x^2+3*2", "x-x", "x*-x", "-x*-x", "3*20*x",
+                           "1/3*x^3-x", "x^3/3-x", "3*2*x-5*x", "-3*x^2-x+1+9*x-3", "1+2^2^3", "2^--2^0", "10-2*(x+1)",
+                           "2*(x+2)^2-4", "10-3*(x+1)^2", "-(x+1)*2+4", "(x+2*(x+1))^2+1", "[x-{2*(x+1)}]^2/4",
+                           "x-1-2-3", "12/3/2*x", "2^3^0"]:
+            self.assertEqual(parse_to_polynomial(expression), parse_to_polynomial(expression, POSTFIX))
+
+        for expression in ["", "()", "x+", "x(1)", "(x", "(x+1]", "x)", "2x", "x y", "x*/2"]:
+            self.assertRaises(ExpressionSyntaxError, parse_to_polynomial, expression)
+            self.assertRaises(ExpressionSyntaxError, parse_to_polynomial, expression, POSTFIX)
+
     def test_get_full_coefficient(self):
         self.assertEqual(parse_to_polynomial("x^2-1").get_full_coefficient(), [1, 0, -1])
         self.assertEqual(parse_to_polynomial("x^2-2*x-1").get_full_coefficient(), [1, -2, -1])
@@ -371,6 +622,69 @@ class Tests(unittest.TestCase):
         self.assertEqual(parse_to_polynomial("3*x^3-6*x^2-24*x").get_lim_at_minus_inf(), float('-inf'))
         self.assertEqual(parse_to_polynomial("-3*x^3-6*x^2-24*x").get_lim_at_minus_inf(), float('inf'))
 
+    def test_eval_horner(self):
+        self.assertEqual(parse_to_polynomial("x^5-5*x^3+4").eval(1), 0)
+        self.assertEqual(parse_to_polynomial("x^4+1").eval(-2), 17)
+        self.assertEqual(parse_to_polynomial("x^3").eval(1e200), float('inf'))
+
+    def test_compile(self):
+        for expression in ["x^5-5*x^3+4", "3*x^3-6*x^2-24*x", "0.1*x^2+x/3-7", "x", "5", "0", "(x+1)^40"]:
+            polynomial = parse_to_polynomial(expression)
+            evaluate = polynomial.compile()
+            for x in [-2.5, -1, 0, 0.1, 1 / 3, 1, 7]:
+                self.assertEqual(evaluate(x), polynomial.eval(x))
+            self.assertIs(polynomial.compile(), evaluate)
+
+        polynomial = parse_to_polynomial("x^2+1")
+        polynomial.compile()
+        self.assertEqual(polynomial.minus(parse_to_polynomial("2")).compile()(3), 8)
+        self.assertEqual(polynomial.compile()(3), 10)
+
+    def test_eval_many(self):
+        polynomial = parse_to_polynomial("3*x^3-6*x^2-24*x")
+        xs = [float('-inf'), -2, 0, 1, 4, float('inf')]
+        self.assertEqual(list(polynomial.eval_many(xs)), [polynomial.eval(x) for x in xs])
+        self.assertEqual(list(parse_to_polynomial("x^2+1").eval_many(array('d', [-1, 0, 1]))), [2, 1, 2])
+        self.assertEqual(list(parse_to_polynomial("x^2+1").eval_many([])), [])
+
+    def test_highest_degree(self):
+        polynomial = parse_to_polynomial("x^3+x")
+        self.assertEqual(polynomial.get_highest_degree(), 3)
+        difference = polynomial.minus(parse_to_polynomial("x^3"))
+        self.assertEqual(difference.get_highest_degree(), 1)
+        self.assertEqual(difference.get_full_coefficient(), [1, 0])
+        self.assertEqual(polynomial.get_highest_degree(), 3)
+        self.assertEqual(parse_to_polynomial("x-x").get_highest_degree(), 0)
+
+    def test_get_root_bound(self):
+        self.assertEqual(parse_to_polynomial("7").get_root_bound(), 0)
+        self.assertEqual(parse_to_polynomial("x^5").get_root_bound(), 1)
+        for expression, largest_root in [("x-3", 3), ("x^2-1000000000000", 1e6), ("(x+1)^6", 1),
+                                         ("x^3-6*x^2+11*x-6", 3), ("0.001*x^2+x", 1000)]:
+            bound = parse_to_polynomial(expression).get_root_bound()
+            self.assertTrue(largest_root < bound <= 16 * largest_root)
+
+        polynomial = parse_to_polynomial("x^2-1000000000000")
+        self.assertGreater(polynomial.get_root_bound(), 1e6)
+        self.assertTrue(1 < polynomial.plus(parse_to_polynomial("999999999999")).get_root_bound() < 2)
+
+    def test_immutable(self):
+        polynomial = parse_to_polynomial("x^2-1")
+        self.assertRaises(AttributeError, setattr, polynomial, "degree", 5)
+        self.assertRaises(AttributeError, delattr, polynomial, "coefficients")
+        self.assertIsInstance(polynomial.coefficients, tuple)
+        self.assertEqual(polynomial.plus(parse_to_polynomial("1")), parse_to_polynomial("x^2"))
+        self.assertEqual(polynomial, parse_to_polynomial("x^2-1"))
+        self.assertIs(copy.deepcopy(polynomial), polynomial)
+        self.assertEqual(pickle.loads(pickle.dumps(polynomial)), polynomial)
+
+    def test_hash(self):
+        self.assertEqual(hash(parse_to_polynomial("(x+1)^2")), hash(parse_to_polynomial("x^2+2*x+1")))
+        self.assertEqual(hash(parse_to_polynomial("x-x")), hash(Polynomial({})))
+        self.assertEqual(Polynomial({0: 2}).coefficients, (2.0,))
+        roots = {parse_to_polynomial("x^2-1"): [-1, 1]}
+        self.assertEqual(roots[parse_to_polynomial("(x-1)*(x+1)")], [-1, 1])
+
     def test_get_coefficient(self):
         self.assertEqual(parse_to_polynomial("x^2+1").get_coefficient(2), 1)
         self.assertEqual(parse_to_polynomial("x^2+1").get_coefficient(1), 0)
@@ -389,6 +703,11 @@ class Tests(unittest.TestCase):
                          parse_to_polynomial("x^3+3*x^2+3*x+1"))
         self.assertEqual(parse_to_polynomial("x+2").power(Polynomial.from_constant(3)),
                          parse_to_polynomial("x^3+6*x^2+12*x+8"))
+        self.assertEqual(parse_to_polynomial("x^2+x+1").power(Polynomial.from_constant(2)),
+                         parse_to_polynomial("x^4+2*x^3+3*x^2+2*x+1"))
+        self.assertEqual(parse_to_polynomial("0").power(Polynomial.from_constant(2)), parse_to_polynomial("0"))
+        self.assertEqual(parse_to_polynomial("0").power(Polynomial.from_constant(0)), parse_to_polynomial("1"))
+        self.assertEqual(parse_to_polynomial("(x+1)^64").get_full_coefficient(), [float(comb(64, k)) for k in range(65)])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,153 @@
+import unittest
+from fractions import Fraction
+from math import gcd, isqrt
+
+# a coefficient typed as a short decimal such as 0.25 or 1.5 is taken as the fraction with a denominator up to this
+MAX_DENOMINATOR = 1000
+# divisors are found by trial division, the pre-pass is skipped when the constant or leading coefficient is larger
+MAX_ENUMERATED_COEFFICIENT = 10 ** 6
+
+
+def to_integer_coefficients(coefficients):
+    # Integer coefficients proportional to the given float ones (ascending order of degree), or None when some
+    # coefficient is not a simple fraction
+    fractions = []
+    for coefficient in coefficients:
+        if coefficient.is_integer():
+            fractions.append(Fraction(int(coefficient)))
+            continue
+        if coefficient != coefficient or abs(coefficient) == float('inf'):
+            return None
+        fraction = Fraction(coefficient).limit_denominator(MAX_DENOMINATOR)
+        if float(fraction) != coefficient:
+            return None
+        fractions.append(fraction)
+
+    scale = 1
+    for fraction in fractions:
+        scale = scale * fraction.denominator // gcd(scale, fraction.denominator)
+    integers = [int(fraction * scale) for fraction in fractions]
+    common_divisor = 0
+    for integer in integers:
+        common_divisor = gcd(common_divisor, integer)
+    return [integer // common_divisor for integer in integers]
+
+
+def get_divisors(number):
+    # positive divisors of a non-zero integer, in ascending order
+    number = abs(number)
+    small, large = [], []
+    for divisor in range(1, isqrt(number) + 1):
+        if number % divisor == 0:
+            small.append(divisor)
+            if divisor != number // divisor:
+                large.append(number // divisor)
+    return small + large[::-1]
+
+
+def divides(divisor, number):
+    return number == 0 if divisor == 0 else number % divisor == 0
+
+
+def divide_exactly(coefficients, p, q):
+    # Quotient of an integer polynomial (ascending order of degree) by (q*x - p), or None when p/q is not a root.
+    # By Gauss's lemma the quotient has integer coefficients when p/q is a root in lowest terms, so the synthetic
+    # division stops at the first coefficient that is not divisible by q.
+    quotient = [0] * (len(coefficients) - 1)
+    carry = coefficients[-1]
+    for degree in reversed(range(len(quotient))):
+        if carry % q != 0:
+            return None
+        quotient[degree] = carry // q
+        carry = coefficients[degree] + p * quotient[degree]
+    if carry != 0:
+        return None
+    return quotient
+
+
+def get_candidates(coefficients, bound):
+    # p/q in lowest terms with p dividing the constant coefficient and q dividing the leading one, |p/q| < bound
+    candidates = []
+    for q in get_divisors(coefficients[-1]):
+        for p in get_divisors(coefficients[0]):
+            if gcd(p, q) == 1 and p < bound * q:
+                candidates.extend([(p, q), (-p, q)])
+    return candidates
+
+
+def extract_rational_roots(coefficients, bound):
+    # Rational roots of an integer polynomial (ascending order of degree, non-zero leading coefficient) whose roots
+    # are all smaller than bound in modulus. Returns the distinct rational roots as Fractions and the integer
+    # coefficients left once every copy of them is divided out.
+    roots = []
+    lowest_degree = next(degree for degree, coefficient in enumerate(coefficients) if coefficient != 0)
+    if lowest_degree > 0:
+        roots.append(Fraction(0))
+        coefficients = coefficients[lowest_degree:]
+    if len(coefficients) == 1 or max(abs(coefficients[0]), abs(coefficients[-1])) > MAX_ENUMERATED_COEFFICIENT:
+        return roots, coefficients
+
+    for p, q in get_candidates(coefficients, bound):
+        if len(coefficients) == 1:
+            break
+        # f(x) = (q*x - p) * g(x) with g integral, so (q - p) divides f(1) and (q + p) divides f(-1)
+        value_at_one = sum(coefficients)
+        value_at_minus_one = sum(coefficients[0::2]) - sum(coefficients[1::2])
+        if not divides(q - p, value_at_one) or not divides(q + p, value_at_minus_one):
+            continue
+
+        quotient = divide_exactly(coefficients, p, q)
+        if quotient is None:
+            continue
+        roots.append(Fraction(p, q))
+        while quotient is not None:
+            coefficients = quotient
+            quotient = divide_exactly(coefficients, p, q) if len(coefficients) > 1 else None
+
+    return sorted(roots), coefficients
+
+
+def get_multiplicities(coefficients, roots):
+    # How many times each rational root (a Fraction) divides the integer polynomial, roots as returned by
+    # extract_rational_roots
+    multiplicities = []
+    for root in roots:
+        if root == 0:
+            multiplicity = next(degree for degree, coefficient in enumerate(coefficients) if coefficient != 0)
+            coefficients = coefficients[multiplicity:]
+        else:
+            multiplicity = 0
+            quotient = divide_exactly(coefficients, root.numerator, root.denominator)
+            while quotient is not None:
+                multiplicity += 1
+                coefficients = quotient
+                quotient = divide_exactly(coefficients, root.numerator, root.denominator) if len(coefficients) > 1 \
+                    else None
+        multiplicities.append(multiplicity)
+    return multiplicities
+
+
+class Tests(unittest.TestCase):
+
+    def test_to_integer_coefficients(self):
+        self.assertEqual(to_integer_coefficients([6.0, 11.0, 6.0, 1.0]), [6, 11, 6, 1])
+        self.assertEqual(to_integer_coefficients([-0.5, 1.5, 0.25]), [-2, 6, 1])
+        self.assertEqual(to_integer_coefficients([4.0, 0.0, 2.0]), [2, 0, 1])
+        self.assertEqual(to_integer_coefficients([0.1, 1.0]), [1, 10])
+        self.assertEqual(to_integer_coefficients([2 ** 0.5, 1.0]), None)
+
+    def test_divide_exactly(self):
+        # (2x^2 + x - 1) / (2x - 1) = x + 1
+        self.assertEqual(divide_exactly([-1, 1, 2], 1, 2), [1, 1])
+        self.assertEqual(divide_exactly([-1, 1, 2], 1, 1), None)
+        self.assertEqual(divide_exactly([1, 0, 1], -1, 1), None)
+
+    def test_extract_rational_roots(self):
+        self.assertEqual(extract_rational_roots([6, 11, 6, 1], 12), ([-3, -2, -1], [1]))
+        # (x - 1)^2 (2x + 3) (x^2 - 2) x
+        roots, remainder = extract_rational_roots([0, -6, 8, 5, -8, -1, 2], 10)
+        self.assertEqual(roots, [Fraction(-3, 2), 0, 1])
+        self.assertEqual(remainder, [-2, 0, 1])
+        self.assertEqual(get_multiplicities([0, -6, 8, 5, -8, -1, 2], roots), [1, 1, 2])
+        self.assertEqual(extract_rational_roots([1, 0, 1], 2), ([], [1, 0, 1]))
+        self.assertEqual(extract_rational_roots([10 ** 7 + 19, 0, 1], 10 ** 4), ([], [10 ** 7 + 19, 0, 1]))
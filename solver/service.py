@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from error import EvaluationError, ExpressionSyntaxError
+from solve import parse_and_solve_and_round
+
+DEFAULT_EPSILON = 0.00001
+# a batch is sent to the pool once it holds this many requests or its first request has waited this many seconds
+MAX_BATCH_SIZE = 64
+MAX_BATCH_DELAY = 0.002
+# requests waiting for a batch, more than this are rejected with 503 instead of piling up in memory
+MAX_QUEUE_SIZE = 4096
+# batches handed to the pool per worker before the next one has to wait
+PENDING_BATCHES_PER_WORKER = 2
+MAX_BODY_SIZE = 1 << 20
+
+
+def solve_batch(requests):
+    # Runs in a worker process, one result per (expression, epsilon) ready to be sent as JSON. Any failure is the
+    # result of its own request only, the other requests of the batch are still answered.
+    results = []
+    for expression, epsilon in requests:
+        try:
+            results.append((HTTPStatus.OK, {"roots": parse_and_solve_and_round(expression, epsilon)}))
+        except (ExpressionSyntaxError, EvaluationError) as error:
+            results.append((HTTPStatus.UNPROCESSABLE_ENTITY,
+                            {"error": {"type": type(error).__name__, "message": str(error)}}))
+        except Exception as error:
+            results.append((HTTPStatus.INTERNAL_SERVER_ERROR,
+                            {"error": {"type": type(error).__name__, "message": str(error)}}))
+    return results
+
+
+def parse_request_body(body):
+    request = json.loads(body)
+    if not isinstance(request, dict) or not isinstance(request.get("expression"), str):
+        raise ValueError("Body must be a JSON object with an expression")
+    epsilon = request.get("epsilon", DEFAULT_EPSILON)
+    # json.loads accepts Infinity and NaN
+    if not isinstance(epsilon, (int, float)) or not epsilon > 0 or not math.isfinite(epsilon):
+        raise ValueError("Epsilon must be a positive number")
+    return request["expression"], epsilon
+
+
+class SolveService:
+    # HTTP/JSON front end of parse_and_solve_and_round. Concurrent requests are queued, grouped into micro-batches
+    # and each batch is solved by one call into a process pool, so the cost of crossing into a worker is paid once
+    # per batch instead of once per request.
+    def __init__(self, workers=None, max_batch_size=MAX_BATCH_SIZE, max_batch_delay=MAX_BATCH_DELAY,
+                 max_queue_size=MAX_QUEUE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.queue = asyncio.Queue(max_queue_size)
+        self.batch_slots = asyncio.Semaphore(self.workers * PENDING_BATCHES_PER_WORKER)
+        self.executor = None
+        self.server = None
+        self.tasks = set()
+        self.statistics = {"requests": 0, "rejected": 0, "batches": 0}
+
+    async def start(self, host="127.0.0.1", port=8080, path=None):
+        # listens on a Unix socket when path is given, otherwise on host:port
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        # the workers are started before listening, a worker forked later would inherit the client sockets and
+        # keep connections open after the service has closed them
+        await asyncio.get_running_loop().run_in_executor(self.executor, solve_batch, [])
+        self.spawn(self.run_batches())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def submit(self, expression, epsilon):
+        # Future of the (status, body) of one request, raises asyncio.QueueFull when the service is saturated
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((expression, epsilon, future))
+        return future
+
+    async def run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self.batch_slots.acquire()
+            self.statistics["batches"] += 1
+            self.spawn(self.dispatch(batch))
+
+    async def dispatch(self, batch):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, solve_batch, [(expression, epsilon) for expression, epsilon, future in batch])
+        except Exception as error:
+            results = [(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": {"type": type(error).__name__,
+                                                                      "message": str(error)}})] * len(batch)
+        finally:
+            self.batch_slots.release()
+
+        for (expression, epsilon, future), result in zip(batch, results):
+            # the client may have gone away in the meantime
+            if not future.done():
+                future.set_result(result)
+
+    async def route(self, method, path, body):
+        if path == "/statistics" and method == "GET":
+            return HTTPStatus.OK, dict(self.statistics, queued=self.queue.qsize())
+        if path != "/solve":
+            return HTTPStatus.NOT_FOUND, {"error": {"type": "NotFound", "message": path}}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": {"type": "MethodNotAllowed", "message": method}}
+
+        try:
+            expression, epsilon = parse_request_body(body)
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": {"type": type(error).__name__, "message": str(error)}}
+        self.statistics["requests"] += 1
+        try:
+            future = self.submit(expression, epsilon)
+        except asyncio.QueueFull:
+            self.statistics["rejected"] += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": {"type": "QueueFull", "message": "Try again later"}}
+        return await future
+
+    async def handle_connection(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive, every request and response body is JSON
+        try:
+            while True:
+                request_line = await reader.readline()
+                if len(request_line) == 0:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, separator, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if not 0 <= length <= MAX_BODY_SIZE:
+                    raise ValueError("Invalid content length")
+
+                status, response = await self.route(method, path, await reader.readexactly(length))
+                body = json.dumps(response).encode()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n{}\r\n".format(
+                    status.value, status.phrase, len(body), "" if keep_alive else "Connection: close\r\n").encode())
+                writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            # malformed request or the client went away, there is nobody left to answer
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, path, workers):
+    service = SolveService(workers)
+    server = await service.start(host, port, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve POST /solve with a JSON body {\"expression\": ..., "
+                                                 "\"epsilon\": ...}")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", help="listen on this Unix socket instead of host:port")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes, 0 for one per CPU")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+class Tests(unittest.TestCase):
+
+    def test_solve_batch(self):
+        self.assertEqual(solve_batch([("x^2-4", 0.001), ("x^2+", 0.001)]), [
+            (HTTPStatus.OK, {"roots": [-2, 2]}),
+            (HTTPStatus.UNPROCESSABLE_ENTITY,
+             {"error": {"type": "ExpressionSyntaxError", "message": "Invalid expression"}})])
+        # an unexpected failure only fails its own request
+        results = solve_batch([("x-1", float("inf")), ("x^2-4", 0.001)])
+        self.assertEqual([status for status, body in results], [HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.OK])
+        self.assertEqual(results[0][1]["error"]["type"], "OverflowError")
+
+    def test_parse_request_body(self):
+        self.assertEqual(parse_request_body('{"expression": "x=1", "epsilon": 0.1}'), ("x=1", 0.1))
+        self.assertEqual(parse_request_body('{"expression": "x=1"}'), ("x=1", DEFAULT_EPSILON))
+        self.assertRaises(ValueError, parse_request_body, '{"expression": "x=1", "epsilon": 0}')
+        self.assertRaises(ValueError, parse_request_body, '{"expression": "x=1", "epsilon": Infinity}')
+        self.assertRaises(ValueError, parse_request_body, '{"expression": "x=1", "epsilon": NaN}')
+        self.assertRaises(ValueError, parse_request_body, '["x=1"]')
+        self.assertRaises(ValueError, parse_request_body, 'x=1')
+
+    def test_service(self):
+        async def request(port, body):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write("POST /solve HTTP/1.1\r\nContent-Length: {}\r\nConnection: close\r\n\r\n{}".format(
+                len(body), body).encode())
+            response = await reader.read()
+            writer.close()
+            head, separator, body = response.partition(b"\r\n\r\n")
+            return int(head.split()[1]), json.loads(body)
+
+        async def run():
+            service = SolveService(workers=1, max_batch_delay=0.05)
+            server = await service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                bodies = ['{{"expression": "x^2-{}", "epsilon": 0.01}}'.format(n * n) for n in range(1, 11)]
+                responses = await asyncio.gather(*(request(port, body) for body in bodies + ['{"expression": "x+"}']))
+                self.assertEqual(responses[:10], [(200, {"roots": [-n, n]}) for n in range(1, 11)])
+                self.assertEqual(responses[10][0], 422)
+                self.assertEqual((await request(port, "{}"))[0], 400)
+                self.assertLess(service.statistics["batches"], 11)
+            finally:
+                await service.close()
+
+        asyncio.run(run())
+
+    def test_queue_full(self):
+        async def run():
+            service = SolveService(workers=1, max_queue_size=1)
+            service.submit("x", 0.1)
+            self.assertEqual((await service.route("POST", "/solve", '{"expression": "x"}'))[0],
+                             HTTPStatus.SERVICE_UNAVAILABLE)
+            self.assertEqual(service.statistics["rejected"], 1)
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
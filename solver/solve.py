@@ -1,7 +1,53 @@
+import os
+import sys
 import unittest
-from math import log
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from itertools import repeat
+from math import frexp, ldexp, log, sqrt
+from typing import List, NamedTuple
 
-from polynomial import parse_to_polynomial
+from closed_form import solve_quadratic, solve_cubic, solve_quartic
+from convolution import to_float
+from deflation import find_all_roots
+from aberth import find_all_roots_simultaneously
+from adaptive_precision import SignEvaluator, get_error_bound
+from error import EvaluationError, ExpressionSyntaxError
+from instrumentation import get_active_counter, measure_stage, count_depth, instrument
+from parse_cache import parse_to_polynomial_cached
+from polynomial import parse_to_polynomial, Polynomial
+from rational_roots import to_integer_coefficients, extract_rational_roots, get_multiplicities
+from sparse import SPARSE_MIN_DEGREE, SparsePolynomial, count_sign_changes
+from sturm import isolate_real_roots
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BISECTION = "bisection"
+NEWTON = "newton"
+# bisection on signs that are always exact, see find_root_using_adaptive_bisection
+ADAPTIVE = "adaptive"
+
+DERIVATIVE = "derivative"
+COMPANION_MATRIX = "companion"
+DEFLATION = "deflation"
+STURM = "sturm"
+ABERTH = "aberth"
+AUTO = "auto"
+# with AUTO, polynomials of at least this degree are solved with the companion matrix when NumPy is available and
+# by deflation otherwise
+COMPANION_MATRIX_MIN_DEGREE = 10
+
+INF = float('inf')
+MINUS_INF = float('-inf')
+
+CLOSED_FORM_SOLVERS = {2: solve_quadratic, 3: solve_cubic, 4: solve_quartic}
+# the derivatives of a polynomial whose coefficients exceed this are scaled down before they are solved, see
+# scale_coefficients
+LARGE_COEFFICIENT = 2.0 ** 512
 
 
 def convert_from_epsilon_to_n_digit(epsilon):
@@ -19,111 +65,677 @@ def try_round_root(polynomial, raw_root, n_digits):
         return raw_root
 
 
-def find_root_using_bisection(polynomial, epsilon, lower, upper):
-    if polynomial.eval(lower) * polynomial.eval(upper) > 0:
+def find_root_using_bisection(polynomial, epsilon, lower, upper, counter=None):
+    value_at_upper = polynomial.eval(upper)
+    if polynomial.eval(lower) * value_at_upper > 0:
         return None
 
+    iterations = 0
+    evaluate = polynomial.compile()
     middle = (lower + upper) / 2
-    while polynomial.eval(middle) != 0 and abs(upper - lower) > epsilon:
-        if polynomial.eval(middle) * polynomial.eval(upper) > 0:
+    value_at_middle = evaluate(middle)
+    while value_at_middle != 0 and abs(upper - lower) > epsilon:
+        if value_at_middle * value_at_upper > 0:
             upper = middle
+            value_at_upper = value_at_middle
         else:
             lower = middle
         middle = (lower + upper) / 2
+        value_at_middle = evaluate(middle)
+        iterations += 1
+
+    if counter is not None:
+        counter["iterations"] += iterations
 
     n_digits = convert_from_epsilon_to_n_digit(epsilon)
     middle = try_round_root(polynomial, middle, n_digits)
     return middle
 
 
-def find_root(polynomial, epsilon, lower, upper):
-    if polynomial.eval(lower) == 0:
-        return None
-    if polynomial.eval(upper) == 0:
-        return upper
-    if polynomial.eval(lower) * polynomial.eval(upper) > 0:
+def find_root_using_adaptive_bisection(polynomial, epsilon, lower, upper, counter=None, sign=None):
+    # Bisection deciding on which side of the middle the root lies from the exact sign of the polynomial there. The
+    # float value of an ill-conditioned polynomial is rounding noise close to its roots, plain bisection may follow
+    # a wrong sign there. Signs are found in float arithmetic with an error bound, and only the points where the
+    # bound cannot decide are evaluated in higher precision, see SignEvaluator.
+    if sign is None:
+        sign = SignEvaluator(polynomial, counter)
+    sign_at_upper = sign(upper)
+    if sign(lower) * sign_at_upper > 0:
         return None
 
-    if lower == float('-inf') and upper == float('inf'):
-        lower = get_lower_bound_with_opposite_sign(polynomial, 0)
-        upper = get_upper_bound_with_opposite_sign(polynomial, 0)
-        
-    elif lower == float('-inf'):
-        lower = get_lower_bound_with_opposite_sign(polynomial, upper)
-        
-    elif upper == float('inf'):
-        upper = get_upper_bound_with_opposite_sign(polynomial, lower)
+    iterations = 0
+    evaluate = sign.evaluate
+    # the error bound of Horner's rule grows with |x|, the one at the end of the bracket farthest from 0 holds for
+    # every middle, only the values it cannot decide are checked against their own bound by get_sign
+    threshold = sign.get_error_bound(max(abs(lower), abs(upper)))
+    middle = (lower + upper) / 2
+    sign_at_middle = sign(middle)
+    while sign_at_middle != 0 and abs(upper - lower) > epsilon:
+        if sign_at_middle * sign_at_upper > 0:
+            upper = middle
+        else:
+            lower = middle
+        middle = (lower + upper) / 2
+        value = evaluate(middle)
+        if abs(value) > threshold:
+            sign_at_middle = (value > 0) - (value < 0)
+        else:
+            sign_at_middle = sign.get_sign(middle, value)
+        iterations += 1
+
+    if counter is not None:
+        counter["iterations"] += iterations
 
-    return find_root_using_bisection(polynomial, epsilon, lower, upper)
+    n_digits = convert_from_epsilon_to_n_digit(epsilon)
+    return try_round_root(polynomial, middle, n_digits)
 
 
-def get_lower_bound_with_opposite_sign(polynomial, upper, init_step=1):
-    if polynomial.eval(float('-inf')) * polynomial.eval(upper) > 0:
+def find_root_using_newton(polynomial, derivative, epsilon, lower, upper, counter=None, start=None):
+    # Newton's method safeguarded by the bracket [lower, upper]: whenever the Newton step leaves the bracket
+    # or does not at least halve the step before last, a bisection step is taken instead, so the sign change
+    # is never lost. Iterations start from start when it is inside the bracket, from the middle otherwise.
+    # Reference: rtsafe, Numerical Recipes 9.4
+    value_at_lower = polynomial.eval(lower)
+    value_at_upper = polynomial.eval(upper)
+    if value_at_lower * value_at_upper > 0:
         return None
 
-    step = init_step
-    lower = upper - step
-    while polynomial.eval(lower) * polynomial.eval(upper) > 0:
-        step = step * 2
-        lower = lower - step
+    iterations = 0
+    if value_at_lower == 0:
+        x = lower
+    elif value_at_upper == 0:
+        x = upper
+    elif start is not None and lower < start < upper:
+        x = start
+    else:
+        x = (lower + upper) / 2
+    evaluate = polynomial.compile()
+    evaluate_derivative = derivative.compile()
+    previous_step = step_before_previous = upper - lower
+    while value_at_lower != 0 and value_at_upper != 0:
+        value = evaluate(x)
+        slope = evaluate_derivative(x)
+        iterations += 1
+        if value == 0:
+            break
+
+        if value * value_at_upper > 0:
+            upper = x
+            value_at_upper = value
+        else:
+            lower = x
+
+        step = value / slope if slope != 0 else INF
+        if abs(step) <= epsilon / 2:
+            x = x - step
+            break
+        if not lower < x - step < upper or abs(step) > abs(step_before_previous) / 2:
+            step = x - (lower + upper) / 2
+        x = x - step
+        step_before_previous = previous_step
+        previous_step = step
+        if abs(upper - lower) <= epsilon:
+            break
+
+    if counter is not None:
+        counter["iterations"] += iterations
 
-    return lower
+    n_digits = convert_from_epsilon_to_n_digit(epsilon)
+    return try_round_root(polynomial, x, n_digits)
+
+
+def refine_root(polynomial, epsilon, lower, upper, refinement=BISECTION, derivative=None, counter=None):
+    if refinement == BISECTION:
+        return find_root_using_bisection(polynomial, epsilon, lower, upper, counter)
+    elif refinement == NEWTON:
+        if derivative is None:
+            derivative = polynomial.derivative()
+        return find_root_using_newton(polynomial, derivative, epsilon, lower, upper, counter)
+    elif refinement == ADAPTIVE:
+        return find_root_using_adaptive_bisection(polynomial, epsilon, lower, upper, counter)
+    else:
+        raise ValueError("Not supported refinement: " + str(refinement))
 
 
-def get_upper_bound_with_opposite_sign(polynomial, lower, init_step=1):
-    if polynomial.eval(float('inf')) * polynomial.eval(lower) > 0:
+def find_root(polynomial, epsilon, lower, upper, refinement=BISECTION, derivative=None, counter=None):
+    if refinement == ADAPTIVE:
+        # the bracket is checked with exact signs as well
+        evaluate = sign = SignEvaluator(polynomial, counter)
+    else:
+        evaluate = polynomial.eval
+    value_at_lower = evaluate(lower)
+    value_at_upper = evaluate(upper)
+    if value_at_lower == 0:
+        return None
+    if value_at_upper == 0:
+        return upper
+    if value_at_lower * value_at_upper > 0:
         return None
 
-    step = init_step
-    upper = lower + step
-    while polynomial.eval(lower) * polynomial.eval(upper) > 0:
-        step = step * 2
-        upper = upper + step
+    lower, upper = get_finite_bracket(polynomial, lower, upper, counter)
+    if refinement == ADAPTIVE:
+        return find_root_using_adaptive_bisection(polynomial, epsilon, lower, upper, counter, sign)
+    return refine_root(polynomial, epsilon, lower, upper, refinement, derivative, counter)
+
 
-    return upper
+def get_finite_bracket(polynomial, lower, upper, counter=None):
+    # No root lies beyond the root bound, so an infinite end of a bracket can be moved there without losing a root
+    # and the polynomial keeps the sign of its limit on the way. counter["bracket_expansions"] counts the moved ends.
+    if lower == MINUS_INF:
+        lower = min(-polynomial.get_root_bound(), upper - polynomial.get_root_bound())
+        if counter is not None:
+            counter["bracket_expansions"] += 1
+    if upper == INF:
+        upper = max(polynomial.get_root_bound(), lower + polynomial.get_root_bound())
+        if counter is not None:
+            counter["bracket_expansions"] += 1
+    return lower, upper
 
 
-def solve_from_derivative_roots(polynomial, epsilon, derivative_roots):
+def solve_from_derivative_roots(polynomial, epsilon, derivative_roots, refinement=BISECTION, derivative=None,
+                                counter=None):
     roots = []
-    check_points = derivative_roots.copy()
-    check_points.insert(0, float('-inf'))
-    check_points.append(float('inf'))
+    check_points = [MINUS_INF] + derivative_roots + [INF]
+    check_points[0], check_points[1] = get_finite_bracket(polynomial, check_points[0], check_points[1], counter)
+    check_points[-2], check_points[-1] = get_finite_bracket(polynomial, check_points[-2], check_points[-1],
+                                                              counter)
 
     for index in range(0, len(check_points) - 1):
-        root = find_root(polynomial, epsilon, check_points[index], check_points[index + 1])
+        root = find_root(polynomial, epsilon, check_points[index], check_points[index + 1], refinement, derivative,
+                         counter)
         if root is not None:
             roots.append(root)
         
     return roots
 
 
-def solve_equation(polynomial, epsilon):
+def polish_root(polynomial, derivative, root, max_iterations=8):
+    # Newton steps from an already close root, stopping as soon as a step does not reduce the residual
+    value = polynomial.eval(root)
+    for i in range(max_iterations):
+        slope = derivative.eval(root)
+        if value == 0 or slope == 0:
+            break
+        candidate = root - value / slope
+        value_at_candidate = polynomial.eval(candidate)
+        if abs(value_at_candidate) >= abs(value):
+            break
+        root = candidate
+        value = value_at_candidate
+
+    return root
+
+
+def get_root_tolerance(epsilon):
+    # A root of multiplicity m comes back from a numerical solver as a cluster of values spread by about the m-th
+    # root of the machine epsilon, some of them off the real axis. Values that close (relative, enough for triple
+    # roots) to the real axis are taken as approximations of real roots, which RootChecker then confirms.
+    return max(epsilon, sys.float_info.epsilon ** (1 / 3))
+
+
+# RootChecker.confirm returns this when p is rounding noise at an approximation but neither p nor p' changes sign
+UNCONFIRMED = "unconfirmed"
+
+
+class RootChecker:
+    # Confirms approximations of real roots with exact signs, see SignEvaluator. Neighbouring approximations are
+    # grouped, a multiple root comes back as a cluster of them, and each group is only reported as a root when the
+    # signs of p around it, or those of p' for a root of even multiplicity, show that there is one.
+    def __init__(self, polynomial, epsilon, derivative=None):
+        self.polynomial = polynomial
+        self.epsilon = epsilon
+        self.n_digits = convert_from_epsilon_to_n_digit(epsilon)
+        self.derivative = polynomial.derivative() if derivative is None else derivative
+
+    @cached_property
+    def sign(self):
+        return SignEvaluator(self.polynomial)
+
+    @cached_property
+    def derivative_sign(self):
+        return SignEvaluator(self.derivative)
+
+    def is_noise(self, x):
+        # p(x) is within the error bound of Horner's rule, p may be 0 at x
+        return abs(self.polynomial.eval(x)) <= get_error_bound(self.polynomial.coefficients, abs(x))
+
+    def get_radius(self, x):
+        # some root lies within n |p(x) / p'(x)| of x, p(x) being at least the rounding noise
+        slope = self.derivative.eval(x)
+        if slope == 0:
+            return INF
+        value = max(abs(self.polynomial.eval(x)), get_error_bound(self.polynomial.coefficients, abs(x)))
+        return self.polynomial.get_highest_degree() * value / abs(slope)
+
+    def is_same_root(self, roots, index):
+        # roots[index - 1] and roots[index] always stand for the same root when closer than epsilon. Farther apart
+        # they only stand for one multiple root when p is rounding noise at their midpoint, as it is all over such a
+        # cluster, and has there the sign it has on one side of the pair: between two simple roots it has the
+        # opposite sign of both sides. The points on the sides stop halfway to the next approximations.
+        lower, upper = roots[index - 1], roots[index]
+        gap = upper - lower
+        if gap <= self.epsilon * max(1, abs(upper)):
+            return True
+        if not self.is_noise(lower + gap / 2):
+            return False
+        outer_lower = lower - gap / 2
+        if index > 1:
+            outer_lower = max(outer_lower, (roots[index - 2] + lower) / 2)
+        outer_upper = upper + gap / 2
+        if index < len(roots) - 1:
+            outer_upper = min(outer_upper, (upper + roots[index + 1]) / 2)
+        middle = self.sign(lower + gap / 2)
+        return middle == 0 or middle == self.sign(outer_lower) or middle == self.sign(outer_upper)
+
+    def group(self, roots):
+        groups = []
+        for index in range(len(roots)):
+            if index > 0 and self.is_same_root(roots, index):
+                groups[-1].append(roots[index])
+            else:
+                groups.append([roots[index]])
+        return groups
+
+    def confirm(self, lower, upper, center):
+        # The root approximated by center in [lower, upper], an interval enclosing it. A root of odd multiplicity
+        # when p changes sign, found by bisection unless the interval is already about epsilon wide. A root of even
+        # multiplicity when p is rounding noise at center and p' changes sign, at the root of p'. None when there is
+        # no root, and UNCONFIRMED when p is rounding noise at center but neither sign changes.
+        if self.sign(lower) * self.sign(upper) <= 0:
+            # about 2 epsilon wide, up to the rounding of center -/+ radius
+            if upper - lower <= 3 * self.epsilon * max(1, abs(center)):
+                return try_round_root(self.polynomial, center, self.n_digits)
+            return find_root_using_adaptive_bisection(self.polynomial, self.epsilon, lower, upper, sign=self.sign)
+        if not self.is_noise(center):
+            return None
+        derivative_sign = self.derivative_sign
+        if derivative_sign(lower) * derivative_sign(upper) < 0:
+            # a simple root of p' in most cases, which Newton's method finds faster than bisection
+            critical_point = polish_root(self.derivative, self.derivative.derivative(), center)
+            width = self.epsilon * max(1, abs(critical_point))
+            if not lower < critical_point < upper or \
+                    derivative_sign(critical_point - width) * derivative_sign(critical_point + width) > 0:
+                critical_point = find_root_using_adaptive_bisection(self.derivative, self.epsilon, lower, upper,
+                                                                    sign=derivative_sign)
+            critical_point = try_round_root(self.polynomial, critical_point, self.n_digits)
+            return critical_point if self.is_noise(critical_point) else None
+        return UNCONFIRMED
+
+    def get_interval(self, groups, index, center, radius):
+        # center -/+ radius, stopping halfway to the neighbouring groups and at the root bound
+        lower, upper = center - radius, center + radius
+        if index > 0:
+            lower = max(lower, (groups[index - 1][-1] + groups[index][0]) / 2)
+        if index < len(groups) - 1:
+            upper = min(upper, (groups[index][-1] + groups[index + 1][0]) / 2)
+        return get_finite_bracket(self.polynomial, lower, upper)
+
+    def confirm_groups(self, roots, from_formula=False):
+        # The roots confirmed among sorted approximations, None as soon as a group is UNCONFIRMED. A group is checked
+        # in an interval about epsilon wider than it, and again in the wider interval given by get_radius when that
+        # finds nothing. from_formula is for the real roots given by a closed form: a lone one is a root, and a
+        # cluster that cannot be confirmed is taken as a root at its center.
+        groups = self.group(roots)
+        confirmed = []
+        for index, group in enumerate(groups):
+            center = sum(group) / len(group)
+            if from_formula and len(group) == 1:
+                confirmed.append(try_round_root(self.polynomial, center, self.n_digits))
+                continue
+            radius = max(group[-1] - center, center - group[0], self.epsilon * max(1, abs(center)))
+            root = self.confirm(*self.get_interval(groups, index, center, radius), center)
+            if root is None or root is UNCONFIRMED:
+                newton_radius = self.get_radius(center)
+                if newton_radius > radius:
+                    root = self.confirm(*self.get_interval(groups, index, center, newton_radius), center)
+            if root is UNCONFIRMED:
+                if not from_formula:
+                    return None
+                root = try_round_root(self.polynomial, center, self.n_digits)
+            if root is not None:
+                confirmed.append(root)
+
+        return confirmed
+
+
+def get_critical_points(derivative):
+    # real roots of the derivative of a polynomial solved in closed form, as the formulas give them
+    coefficients = derivative.get_full_coefficient()
+    if len(coefficients) == 2:
+        return [-coefficients[1] / coefficients[0]]
+    return CLOSED_FORM_SOLVERS[len(coefficients) - 1](*coefficients)
+
+
+def solve_using_closed_form(polynomial, epsilon):
+    # Rounding may split a double root into two close real roots, which RootChecker merges, or into a pair of
+    # complex roots the formulas leave out. A double root is a root of p', so when some roots are left out the
+    # critical points at which p is rounding noise are checked as well, unless a root already lies where p is that
+    # close to p(c) around the critical point c.
+    coefficients = polynomial.get_full_coefficient()
+    raw_roots = CLOSED_FORM_SOLVERS[len(coefficients) - 1](*coefficients)
+    derivative = polynomial.derivative()
+    checker = RootChecker(polynomial, epsilon, derivative)
+    roots = checker.confirm_groups(sorted(polish_root(polynomial, derivative, raw_root) for raw_root in raw_roots),
+                                   from_formula=True)
+    if len(raw_roots) == len(coefficients) - 1:
+        return roots
+
+    for critical_point in get_critical_points(derivative):
+        if not checker.is_noise(critical_point):
+            continue
+        curvature = abs(derivative.derivative().eval(critical_point))
+        if curvature == 0:
+            continue
+        # |p(c + t) - p(c)| is about p''(c) t^2 / 2
+        radius = max(sqrt(2 * get_error_bound(polynomial.coefficients, abs(critical_point)) / curvature),
+                     epsilon * max(1, abs(critical_point)))
+        lower, upper = critical_point - radius, critical_point + radius
+        if any(lower <= root <= upper for root in roots):
+            continue
+        root = checker.confirm(lower, upper, critical_point)
+        if root is not None and root is not UNCONFIRMED:
+            roots.append(root)
+
+    return sorted(roots)
+
+
+def solve_using_sturm(polynomial, epsilon, refinement=BISECTION, counter=None):
+    # Each isolating interval holds exactly one root, so it goes straight to refinement without solving the derivatives
+    derivative = polynomial.derivative()
+    roots = []
+    for lower, upper in isolate_real_roots(polynomial, epsilon):
+        if polynomial.eval(upper) == 0:
+            roots.append(upper)
+        elif polynomial.eval(lower) * polynomial.eval(upper) < 0:
+            roots.append(refine_root(polynomial, epsilon, lower, upper, refinement, derivative, counter))
+        else:
+            # a root of even multiplicity does not change the sign, the interval is already narrower than epsilon
+            root = polish_root(polynomial, derivative, (lower + upper) / 2)
+            roots.append(try_round_root(polynomial, root, convert_from_epsilon_to_n_digit(epsilon)))
+
+    return roots
+
+
+def is_almost_real(z, epsilon):
+    return abs(z.imag) <= get_root_tolerance(epsilon) * max(1, abs(z))
+
+
+def solve_using_companion_matrix(polynomial, epsilon):
+    # The eigenvalues of the companion matrix are the roots of the polynomial. Reference:
+    # https://en.wikipedia.org/wiki/Companion_matrix
+    if numpy is None:
+        raise ImportError("NumPy is required by the companion matrix method")
+
+    coefficients = polynomial.get_full_coefficient()
+    degree = len(coefficients) - 1
+    companion = numpy.zeros((degree, degree))
+    companion[0, :] = -numpy.array(coefficients[1:]) / coefficients[0]
+    companion[1:, :-1] = numpy.eye(degree - 1)
+    eigenvalues = numpy.linalg.eigvals(companion)
+    # confirmed as the approximations of any other method, None when they cannot be, see get_real_roots
+    return get_real_roots(polynomial, [complex(z) for z in eigenvalues], epsilon)
+
+
+def solve_using_deflation(polynomial, epsilon):
+    # Roots are found one by one and divided out, so each search runs on a smaller polynomial. Real roots are then
+    # polished and confirmed on the original polynomial by get_real_roots, which removes the error accumulated by the
+    # successive divisions. None when a root cannot be confirmed, see solve_numerically.
+    coefficients = list(polynomial.coefficients)
+    return get_real_roots(polynomial, find_all_roots(coefficients, lambda z: is_almost_real(z, epsilon)), epsilon)
+
+
+def get_real_roots(polynomial, complex_roots, epsilon):
+    # The real roots among approximations of every root of polynomial, as solve_equation returns them. The
+    # approximation of an ill-conditioned real root may stop farther from the real axis than is_almost_real accepts,
+    # so every other approximation z is checked too: p changes its exact sign between z.real -/+ 2|z.imag| when a
+    # real root of odd multiplicity lies there, which is then found by bisection unless it is already known.
+    # Every root is confirmed by RootChecker, and None is returned when one cannot be, so that the caller falls back
+    # to the critical points.
+    derivative = polynomial.derivative()
+    checker = RootChecker(polynomial, epsilon, derivative)
+    roots = checker.confirm_groups(sorted(polish_root(polynomial, derivative, z.real)
+                                          for z in complex_roots if is_almost_real(z, epsilon)))
+    if roots is None:
+        return None
+    for z in sorted((z for z in complex_roots if not is_almost_real(z, epsilon)), key=lambda z: abs(z.imag)):
+        lower, upper = z.real - 2 * abs(z.imag), z.real + 2 * abs(z.imag)
+        if any(lower <= root <= upper for root in roots):
+            continue
+        root = checker.confirm(lower, upper, z.real)
+        if root is UNCONFIRMED:
+            return None
+        if root is not None:
+            roots.append(root)
+    return sorted(roots)
+
+
+def solve_using_aberth(polynomial, epsilon):
+    return get_real_roots(polynomial, find_all_roots_simultaneously(polynomial.coefficients), epsilon)
+
+
+def select_method(polynomial, method):
+    if method == AUTO:
+        if polynomial.get_highest_degree() >= COMPANION_MATRIX_MIN_DEGREE:
+            return COMPANION_MATRIX if numpy is not None else DEFLATION
+        return DERIVATIVE
+    elif method in [DERIVATIVE, COMPANION_MATRIX, DEFLATION, STURM, ABERTH]:
+        return method
+    else:
+        raise ValueError("Not supported method: " + str(method))
+
+
+def get_rational_roots(polynomial):
+    # The exact rational roots of a polynomial whose coefficients are integers or simple fractions, and the
+    # polynomial left once they are divided out
+    integer_coefficients = to_integer_coefficients(polynomial.coefficients)
+    if integer_coefficients is None:
+        return [], polynomial
+    roots, remainder = extract_rational_roots(integer_coefficients, polynomial.get_root_bound())
+    if len(roots) == 0:
+        return [], polynomial
+    return [float(root) for root in roots], Polynomial.from_coefficients(map(to_float, remainder))
+
+
+def solve_equation(polynomial, epsilon, refinement=BISECTION, counter=None, method=AUTO):
+    # counter collects evaluation and iteration counts, it defaults to the one of the enclosing instrument() block
+    if counter is None:
+        counter = get_active_counter()
     if polynomial.get_highest_degree() == 0:
         if polynomial.get_coefficient(0) != 0:
             return []
         else:
             return ["Infinite roots"]
 
+    if method == AUTO and refinement != ADAPTIVE and polynomial.get_highest_degree() >= SPARSE_MIN_DEGREE:
+        # exact signs need the dense coefficients, see SignEvaluator
+        sparse = SparsePolynomial.from_coefficients(polynomial.coefficients)
+        if sparse.is_sparse():
+            return solve_sparse(sparse, epsilon, refinement, counter)
+
+    if polynomial.get_highest_degree() > 1:
+        rational_roots, polynomial = get_rational_roots(polynomial)
+        if polynomial.get_highest_degree() == 0:
+            return rational_roots
+        if len(rational_roots) > 0:
+            return sorted(rational_roots + solve_numerically(polynomial, epsilon, refinement, counter, method))
+
+    return solve_numerically(polynomial, epsilon, refinement, counter, method)
+
+
+def solve_sparse(sparse, epsilon, refinement=BISECTION, counter=None):
+    # Real roots of a SparsePolynomial, without expanding it to its full degree. A factor x^k gives the root 0, a
+    # polynomial in y = x^g is solved for y, and otherwise the roots are isolated by the critical points as in
+    # solve_numerically. The derivative has one term less than the polynomial once its own factor x^k is divided
+    # out, so the recursion is as deep as the number of terms, not the degree. Descartes' rule of signs skips it
+    # when neither side of 0 holds more than one root.
+    roots = []
+    if sparse.get_lowest_degree() > 0:
+        roots.append(0.0)
+        sparse = sparse.divide_by_power(sparse.get_lowest_degree())
+    if sparse.get_highest_degree() == 0:
+        return roots
+    if not sparse.is_sparse():
+        return sorted(roots + solve_equation(sparse.to_polynomial(), epsilon, refinement, counter))
+
+    derivative = sparse.derivative()
+    step = sparse.get_degree_gcd()
+    if step > 1:
+        with count_depth(counter):
+            reduced_roots = solve_sparse(sparse.substitute_power(step), epsilon, refinement, counter)
+        n_digits = convert_from_epsilon_to_n_digit(epsilon)
+        for y in reduced_roots:
+            if y > 0:
+                x = y ** (1 / step)
+                raw_roots = [-x, x] if step % 2 == 0 else [x]
+            elif step % 2 == 1:
+                raw_roots = [-(-y) ** (1 / step)]
+            else:
+                raw_roots = []
+            # a root of q(y) within epsilon is not a root of p(x) within epsilon, Newton's method gets it there
+            roots.extend(try_round_root(sparse, polish_root(sparse, derivative, raw_root), n_digits)
+                         for raw_root in raw_roots)
+        return sorted(roots)
+
+    if max(map(count_sign_changes, sparse.get_signs())) <= 1:
+        # at most one root on each side of 0, where the polynomial is not 0
+        critical_points = [0.0]
+    else:
+        with count_depth(counter):
+            critical_points = solve_sparse(derivative, epsilon, refinement, counter)
+    return sorted(roots + solve_from_derivative_roots(sparse, epsilon, critical_points, refinement, derivative,
+                                                      counter))
+
+
+class ComplexSolution(NamedTuple):
+    # every root repeated by its multiplicity, by increasing real part then imaginary part
+    roots: List[complex]
+    # the real roots, as solve_equation returns them
+    real_roots: List
+
+
+def solve_with_complex_roots(polynomial, epsilon):
+    # Every root of the polynomial, complex ones included, and its real roots, in one pass. The rational roots are
+    # found exactly as in solve_equation, all the others together by the Aberth-Ehrlich iteration, and the real roots
+    # are picked out of those.
+    if polynomial.get_highest_degree() == 0:
+        return ComplexSolution([], solve_equation(polynomial, epsilon))
+
+    roots = []
+    real_roots = []
+    integer_coefficients = to_integer_coefficients(polynomial.coefficients)
+    if polynomial.get_highest_degree() > 1 and integer_coefficients is not None:
+        rational_roots, remainder = extract_rational_roots(integer_coefficients, polynomial.get_root_bound())
+        if len(rational_roots) > 0:
+            for root, multiplicity in zip(rational_roots, get_multiplicities(integer_coefficients, rational_roots)):
+                roots.extend([complex(root)] * multiplicity)
+            real_roots = [float(root) for root in rational_roots]
+            polynomial = Polynomial.from_coefficients(map(to_float, remainder))
+
+    if polynomial.get_highest_degree() > 0:
+        complex_roots = find_all_roots_simultaneously(polynomial.coefficients)
+        roots.extend(complex_roots)
+        remaining_real_roots = get_real_roots(polynomial, complex_roots, epsilon)
+        if remaining_real_roots is None:
+            remaining_real_roots = solve_numerically(polynomial, epsilon, method=DERIVATIVE)
+        real_roots.extend(remaining_real_roots)
+    return ComplexSolution(sorted(roots, key=lambda z: (z.real, z.imag)), sorted(real_roots))
+
+
+def solve_numerically(polynomial, epsilon, refinement=BISECTION, counter=None, method=AUTO):
+    # polynomial must not be constant
     if polynomial.get_highest_degree() == 1:
         [a, b] = polynomial.get_full_coefficient()
         return [-b / a]
-    else:
-        derivative = polynomial.derivative()
-        derivative_roots = solve_equation(derivative, epsilon)
-        return solve_from_derivative_roots(polynomial, epsilon, derivative_roots)
+    elif polynomial.get_highest_degree() in CLOSED_FORM_SOLVERS:
+        return solve_using_closed_form(polynomial, epsilon)
+    elif select_method(polynomial, method) == STURM:
+        return solve_using_sturm(polynomial, epsilon, refinement, counter)
+
+    roots = None
+    if select_method(polynomial, method) == COMPANION_MATRIX:
+        roots = solve_using_companion_matrix(polynomial, epsilon)
+    elif select_method(polynomial, method) == DEFLATION:
+        roots = solve_using_deflation(polynomial, epsilon)
+    elif select_method(polynomial, method) == ABERTH:
+        roots = solve_using_aberth(polynomial, epsilon)
+    if roots is not None:
+        return roots
+    if select_method(polynomial, method) != DERIVATIVE:
+        # get_real_roots could not confirm the approximations, those of the derivatives are hardly better
+        method = DERIVATIVE
+
+    derivative = polynomial.derivative()
+    with count_depth(counter):
+        derivative_roots = solve_equation(scale_coefficients(derivative), epsilon, refinement, counter, method)
+    return solve_from_derivative_roots(polynomial, epsilon, derivative_roots, refinement, derivative, counter)
+
+
+def scale_coefficients(polynomial):
+    # The k-th derivative of a polynomial of degree n has coefficients up to n! / (n - k)! times its own, which
+    # overflow for a high degree. A polynomial with coefficients above LARGE_COEFFICIENT is multiplied by a power of
+    # two, which is exact and keeps its roots, so that its largest coefficient is below 1.
+    largest = max(map(abs, polynomial.coefficients))
+    if largest <= LARGE_COEFFICIENT:
+        return polynomial
+    exponent = frexp(largest)[1]
+    return Polynomial.from_coefficients([ldexp(coefficient, -exponent) for coefficient in polynomial.coefficients])
+
+
+def solve_for_levels(polynomial, levels, epsilon, refinement=BISECTION, counter=None):
+    # Roots of polynomial(x) = level for every level, in the order of levels. Only the constant term differs from one
+    # equation to the next, so the critical points and the values of the polynomial there are found once. Each level
+    # then only refines the intervals between critical points in which polynomial - level changes sign.
+    if polynomial.get_highest_degree() == 0:
+        return [["Infinite roots"] if polynomial.get_coefficient(0) == level else [] for level in levels]
+    if polynomial.get_highest_degree() in CLOSED_FORM_SOLVERS or polynomial.get_highest_degree() == 1:
+        return [solve_equation(polynomial.minus(Polynomial.from_constant(level)), epsilon, refinement, counter)
+                for level in levels]
 
+    derivative = polynomial.derivative()
+    critical_points = solve_equation(derivative, epsilon, refinement, counter, DERIVATIVE)
+    critical_values = [polynomial.eval(x) for x in critical_points]
+    results = []
+    for level in levels:
+        shifted = polynomial.minus(Polynomial.from_constant(level))
+        lower, first_point = get_finite_bracket(shifted, MINUS_INF, critical_points[0] if critical_points else INF,
+                                                counter)
+        last_point, upper = get_finite_bracket(shifted, critical_points[-1] if critical_points else lower, INF,
+                                                counter)
+        check_points = [lower] + critical_points + [upper]
+        values = [shifted.eval(lower)] + [value - level for value in critical_values] + [shifted.eval(upper)]
 
-def parse_and_solve_and_round(expression, epsilon):
+        roots = []
+        for index in range(len(check_points) - 1):
+            # same decisions as find_root, from the values known in advance
+            if values[index] == 0:
+                continue
+            if values[index + 1] == 0:
+                roots.append(check_points[index + 1])
+            elif values[index] * values[index + 1] < 0:
+                roots.append(refine_root(shifted, epsilon, check_points[index], check_points[index + 1], refinement,
+                                         derivative, counter))
+        results.append(roots)
+    return results
+
+
+def parse_equation(expression):
+    # The polynomial whose roots are the solutions of expression, which is either a polynomial or an equation
     if expression.find("=") < 0:
-        roots = solve_equation(parse_to_polynomial(expression), epsilon)
-    else:
-        if expression.endswith("=0"):
-            roots = solve_equation(parse_to_polynomial(expression[0:len(expression)-2]), epsilon)
-        else:
-            index_of_equal = expression.find("=")
-            a = parse_to_polynomial(expression[0:index_of_equal])
-            b = parse_to_polynomial(expression[index_of_equal+1:])
-            roots = solve_equation(a.minus(b), epsilon)
+        return parse_to_polynomial_cached(expression)
+    if expression.endswith("=0"):
+        return parse_to_polynomial_cached(expression[0:len(expression)-2])
+
+    index_of_equal = expression.find("=")
+    a = parse_to_polynomial_cached(expression[0:index_of_equal])
+    b = parse_to_polynomial_cached(expression[index_of_equal+1:])
+    return a.minus(b)
+
+
+def parse_and_solve_and_round(expression, epsilon, refinement=BISECTION, method=AUTO):
+    with measure_stage("parse"):
+        polynomial = parse_equation(expression)
+    with measure_stage("solve"):
+        roots = solve_equation(polynomial, epsilon, refinement, method=method)
 
     if roots == ["Infinite roots"]:
         return roots
@@ -131,15 +743,29 @@ def parse_and_solve_and_round(expression, epsilon):
     return list(map(lambda root: round(root, n_digits), roots))
 
 
-class Tests(unittest.TestCase):
+def try_parse_and_solve_and_round(expression, epsilon):
+    try:
+        return parse_and_solve_and_round(expression, epsilon)
+    except (ExpressionSyntaxError, EvaluationError) as error:
+        return error
+
+
+def solve_many(expressions, epsilon, workers=None, chunksize=None):
+    # Results are returned in the order of expressions, an invalid expression yields its error instead of roots
+    expressions = list(expressions)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(expressions) <= 1:
+        return [try_parse_and_solve_and_round(expression, epsilon) for expression in expressions]
+
+    if chunksize is None:
+        # a few chunks per worker keeps the pipe overhead low while still balancing uneven expressions
+        chunksize = max(1, len(expressions) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(try_parse_and_solve_and_round, expressions, repeat(epsilon), chunksize=chunksize))
 
-    def test_get_lower_bound_with_opposite_sign(self):
-        self.assertEqual(get_lower_bound_with_opposite_sign(parse_to_polynomial("x^3"), 1), 0)
-        self.assertEqual(get_lower_bound_with_opposite_sign(parse_to_polynomial("x^2+9"), -2), None)
 
-    def test_get_upper_bound_with_opposite_sign(self):
-        self.assertEqual(get_upper_bound_with_opposite_sign(parse_to_polynomial("x^3"), 1), None)
-        self.assertEqual(get_upper_bound_with_opposite_sign(parse_to_polynomial("x^3"), -10), 5)
+class Tests(unittest.TestCase):
 
     def test_bisect(self):
         epsilon = 0.00001
@@ -157,6 +783,22 @@ class Tests(unittest.TestCase):
         root = find_root_using_bisection(polynomial, epsilon, -100, -10)
         self.assertEqual(root, None)
 
+    def test_get_finite_bracket(self):
+        polynomial = parse_to_polynomial("(x^2-1000000000000)*(x^3+x)")
+        bound = polynomial.get_root_bound()
+        self.assertGreater(bound, 1e6)
+        self.assertEqual(get_finite_bracket(polynomial, MINUS_INF, -1), (-1 - bound, -1))
+        self.assertEqual(get_finite_bracket(polynomial, MINUS_INF, INF), (-bound, bound))
+        self.assertEqual(get_finite_bracket(polynomial, -3e6, INF), (-3e6, bound))
+        self.assertEqual(get_finite_bracket(polynomial, 2, 3), (2, 3))
+        counter = Counter()
+        get_finite_bracket(polynomial, MINUS_INF, INF, counter)
+        get_finite_bracket(polynomial, 2, INF, counter)
+        self.assertEqual(counter["bracket_expansions"], 3)
+
+        roots = solve_from_derivative_roots(polynomial, 0.00001, [-816496.58, -0.000707, 0.000707, 816496.58])
+        self.assertEqual([round(root) for root in roots], [-1000000, 0, 1000000])
+
     def test_solve_from_derivative_roots(self):
         epsilon = 0.00001
         n_digits = convert_from_epsilon_to_n_digit(epsilon)
@@ -283,3 +925,302 @@ class Tests(unittest.TestCase):
         expected_roots = [-0.8734, 0.9431, 5.9969]
         for index in range(len(roots)):
             self.assertEqual(roots[index], expected_roots[index])
+
+    def test_solve_many(self):
+        epsilon = 0.00001
+        expressions = ["x^2-1", "x^2-1=8", "x^2-1=-2*x+2", "x/0", "(x+1", "0*x+0"]
+        for workers in [1, 2]:
+            results = solve_many(expressions, epsilon, workers=workers)
+            self.assertEqual(results[0:3], [[-1, 1], [-3, 3], [-3, 1]])
+            self.assertIsInstance(results[3], EvaluationError)
+            self.assertIsInstance(results[4], ExpressionSyntaxError)
+            self.assertEqual(results[5], ["Infinite roots"])
+        self.assertEqual(solve_many([], epsilon, workers=2), [])
+
+    def test_newton(self):
+        epsilon = 0.00001
+        n_digits = convert_from_epsilon_to_n_digit(epsilon)
+
+        polynomial = parse_to_polynomial("x^3/3-x")
+        root = find_root_using_newton(polynomial, polynomial.derivative(), epsilon, 1, 10)
+        self.assertEqual(round(root, n_digits), 1.7321)
+
+        polynomial = parse_to_polynomial("x^2-x-2")
+        root = find_root_using_newton(polynomial, polynomial.derivative(), epsilon, -100, 0)
+        self.assertEqual(round(root, n_digits), -1)
+
+        polynomial = parse_to_polynomial("x^2-x-2")
+        root = find_root_using_newton(polynomial, polynomial.derivative(), epsilon, -100, -10)
+        self.assertEqual(root, None)
+
+        polynomial = parse_to_polynomial("(x-1)^3")
+        root = find_root_using_newton(polynomial, polynomial.derivative(), epsilon, -3, 10)
+        self.assertEqual(round(root, 3), 1)
+
+    def test_adaptive_bisection(self):
+        epsilon = 0.00001
+        n_digits = convert_from_epsilon_to_n_digit(epsilon)
+        root = find_root_using_adaptive_bisection(parse_to_polynomial("x^3/3-x"), epsilon, 1, 10)
+        self.assertEqual(round(root, n_digits), 1.7321)
+        self.assertEqual(find_root_using_adaptive_bisection(parse_to_polynomial("x^2-x-2"), epsilon, -100, -10), None)
+
+        # the float values of (x-2)^9 around 2 are rounding noise, plain bisection stops far from the root
+        polynomial = parse_to_polynomial("(x-2)^9")
+        self.assertGreater(abs(refine_root(polynomial, 1e-12, 1.5, 2.3) - 2), 1e-4)
+        counter = Counter()
+        self.assertAlmostEqual(refine_root(polynomial, 1e-12, 1.5, 2.3, ADAPTIVE, counter=counter), 2, delta=1e-12)
+        self.assertGreater(counter["exact_evaluations"], 0)
+
+        counter = Counter()
+        for expression in ["x^2-x-2", "x^3/3-x", "x^5-5*x^3+4*x-0.1", "x^6-7*x^4+14*x^2-7+0.3*x"]:
+            polynomial = parse_to_polynomial(expression)
+            roots = solve_equation(polynomial, epsilon, ADAPTIVE, counter)
+            expected_roots = solve_equation(polynomial, epsilon)
+            self.assertEqual(len(roots), len(expected_roots))
+            for root, expected_root in zip(roots, expected_roots):
+                self.assertAlmostEqual(root, expected_root, delta=epsilon)
+        self.assertEqual(counter["exact_evaluations"], 0)
+
+    def test_newton_evaluation_count(self):
+        epsilon = 1e-12
+        polynomial = parse_to_polynomial("x^3/3-x")
+        derivative = polynomial.derivative()
+        with instrument() as bisection_statistics:
+            bisection_root = find_root_using_bisection(polynomial, epsilon, 1, 2)
+        with instrument() as newton_statistics:
+            newton_root = find_root_using_newton(polynomial, derivative, epsilon, 1, 2)
+        self.assertAlmostEqual(bisection_root, newton_root, 10)
+        self.assertLess(newton_statistics.counter["eval_calls"] * 2, bisection_statistics.counter["eval_calls"])
+
+    def test_solve_equation_with_newton(self):
+        for expression in ["x^4-4*x^2+20*x-7", "x^5-5*x^3+4=0", "x^5-6*x^4+4=0", "x^2+2.5*x+1.5", "x^3+6*x^2+11*x+6"]:
+            for epsilon in [0.00001, 1e-12]:
+                self.assertEqual(parse_and_solve_and_round(expression, epsilon, NEWTON),
+                                 parse_and_solve_and_round(expression, epsilon))
+
+    def test_solve_using_closed_form(self):
+        for expression in ["x^2-6*x+1", "x^2+2.5*x+1.5", "6*x^2+11*x+6", "(x-1)^2", "x^3+6*x^2+11*x+6", "x^3/3-x",
+                           "x^3-3*x^2+2*x-10", "(x+1)^2*(x+2)", "(x-2)^3", "x^4-4*x^2+20*x-7", "(x^2-1)*(x^2-4)",
+                           "(x-1)^2*(x+3)*(x-5)", "x^4+1"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                roots = solve_using_closed_form(polynomial, epsilon)
+                derivative_roots = solve_equation(polynomial.derivative(), epsilon)
+                expected_roots = solve_from_derivative_roots(polynomial, epsilon, derivative_roots)
+                self.assertEqual(len(roots), len(expected_roots))
+                for index in range(len(roots)):
+                    self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        self.assertEqual(parse_and_solve_and_round("(x^2-2)^2", 0.00001), [-1.4142, 1.4142])
+        # close simple roots have a tiny discriminant but p changes sign between them
+        roots = parse_and_solve_and_round("(x-0.7)*(x-0.7000001)", 1e-12)
+        self.assertEqual(len(roots), 2)
+        self.assertAlmostEqual(roots[1] - roots[0], 0.0000001, delta=1e-10)
+        self.assertEqual(parse_and_solve_and_round("x^2-2.000001*x+1.000001", 1e-8), [1, 1.000001])
+        # the double root of a cubic whose formula finds a single real root
+        self.assertEqual(parse_and_solve_and_round("(x-1.1)^2*(x+2)", 0.00001), [-2, 1.1])
+        self.assertEqual(parse_and_solve_and_round("(x-1.1)^2*(x+0.7)^2", 1e-12), [-0.7, 1.1])
+
+    def test_root_checker(self):
+        # close simple roots stay apart, only the cluster of a multiple root is merged
+        self.assertEqual(parse_and_solve_and_round("(x-3)*(x-3.00001)", 1e-10), [3, 3.00001])
+        self.assertEqual(parse_and_solve_and_round("(x-2.1)*(x-2.10001)*(x+3.3)", 1e-10), [-3.3, 2.1, 2.10001])
+        checker = RootChecker(parse_to_polynomial("(x-1)^2*(x-2)*(x-2.001)"), 1e-8)
+        self.assertEqual(checker.group([1 - 1e-9, 1 + 1e-9, 2, 2.001]), [[1 - 1e-9, 1 + 1e-9], [2], [2.001]])
+        self.assertEqual(checker.confirm_groups([1 - 1e-9, 1 + 1e-9, 2, 2.001]), [1, 2, 2.001])
+        # neither p nor p' changes sign in (1.4, 1.6), where p is far from 0
+        self.assertIsNone(checker.confirm(1.4, 1.6, 1.5))
+
+        # the approximations of a root of multiplicity 10 are spread by a few hundredths
+        checker = RootChecker(parse_to_polynomial("(x+1.5)^10"), 1e-6)
+        self.assertEqual(checker.confirm_groups([-1.55443, -1.45932]), [-1.5])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_solve_using_companion_matrix(self):
+        for expression in ["x^5-5*x^3+4", "x^5-6*x^4+4", "x^3+6*x^2+11*x+6", "(x^2-1)*(x^2-4)*(x-3)", "x^6+1",
+                           "(x-1)^2*(x+3)*(x-5)*(x-0.3)"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                roots = solve_using_companion_matrix(polynomial, epsilon)
+                expected_roots = solve_equation(polynomial, epsilon, method=DERIVATIVE)
+                self.assertEqual(len(roots), len(expected_roots))
+                for index in range(len(roots)):
+                    self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        roots = parse_and_solve_and_round("(x-1)*(x-2)*(x-3)*(x-4)*(x-5)*(x-6)*(x-7)*(x-8)*(x-9)*(x-10)*(x-11)", 0.00001)
+        self.assertEqual(roots, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+
+        # AUTO solves these with the companion matrix, whose eigenvalues scatter around a multiple root
+        for method in [AUTO, COMPANION_MATRIX]:
+            self.assertEqual(parse_and_solve_and_round("(x+1.5)^10", 1e-6, method=method), [-1.5])
+            self.assertEqual(parse_and_solve_and_round("(x-0.5)^11", 1e-6, method=method), [0.5])
+
+    def test_select_method(self):
+        polynomial = parse_to_polynomial("x^12-1")
+        self.assertEqual(select_method(polynomial, DERIVATIVE), DERIVATIVE)
+        self.assertEqual(select_method(polynomial, COMPANION_MATRIX), COMPANION_MATRIX)
+        self.assertEqual(select_method(polynomial, DEFLATION), DEFLATION)
+        self.assertEqual(select_method(polynomial, STURM), STURM)
+        self.assertEqual(select_method(polynomial, ABERTH), ABERTH)
+        self.assertEqual(select_method(polynomial, AUTO), COMPANION_MATRIX if numpy is not None else DEFLATION)
+        self.assertEqual(select_method(parse_to_polynomial("x^5-1"), AUTO), DERIVATIVE)
+        self.assertRaises(ValueError, select_method, polynomial, "unknown")
+
+    def test_solve_using_deflation(self):
+        for expression in ["x^5-5*x^3+4", "x^5-6*x^4+4", "x^5+x-10", "(x^2-1)*(x^2-4)*(x-3)", "x^6+1", "x^7-x"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                roots = solve_using_deflation(polynomial, epsilon)
+                expected_roots = solve_equation(polynomial, epsilon, method=DERIVATIVE)
+                self.assertEqual(len(roots), len(expected_roots))
+                for index in range(len(roots)):
+                    self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        roots = parse_and_solve_and_round("(x-1)^2*(x+3)*(x-5)*(x-0.3)", 0.00001, method=DEFLATION)
+        self.assertEqual(roots, [-3, 0.3, 1, 5])
+
+        roots = parse_and_solve_and_round("(x-1)*(x-2)*(x-3)*(x-4)*(x-5)*(x-6)*(x-7)*(x-8)*(x-9)", 0.00001,
+                                          method=DEFLATION)
+        self.assertEqual(roots, [1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+        # the approximations of a multiple root are clustered, and those p does not confirm are left out
+        self.assertEqual(parse_and_solve_and_round("(x+1.5)^10", 1e-6, method=DEFLATION), [-1.5])
+        self.assertEqual(parse_and_solve_and_round("(x-0.5)^11", 1e-6, method=DEFLATION), [0.5])
+        # once rounded, (x+1)^200 is rounding noise all over [-3.6, 0] and its derivatives overflow
+        for method in [DEFLATION, DERIVATIVE]:
+            roots = solve_equation(parse_to_polynomial("(x+1)^200"), 1e-6, method=method)
+            self.assertTrue(all(-4 < root < 0 for root in roots))
+
+    def test_solve_using_aberth(self):
+        for expression in ["x^5-5*x^3+4", "x^5-6*x^4+4", "x^5+x-10", "(x^2-1)*(x^2-4)*(x-3)", "x^6+1", "x^7-x"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                roots = solve_using_aberth(polynomial, epsilon)
+                expected_roots = solve_equation(polynomial, epsilon, method=DERIVATIVE)
+                self.assertEqual(len(roots), len(expected_roots))
+                for index in range(len(roots)):
+                    self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        roots = parse_and_solve_and_round("(x-1)^2*(x+3.5)*(x-5)*(x-0.3)*(x^2+1)", 0.00001, method=ABERTH)
+        self.assertEqual(roots, [-3.5, 0.3, 1, 5])
+
+        # approximations off the real axis are real roots when p changes sign under them
+        polynomial = parse_to_polynomial("(x-1)*(x-2)*(x-3)*(x^2+1)")
+        self.assertEqual(get_real_roots(polynomial, [1 + 1e-3j, 2 - 1e-3j, 3, 1j, -1j], 0.00001), [1, 2, 3])
+
+        # Wilkinson-type polynomials, where ill-conditioned real roots stop far from the real axis in the iteration
+        for n in [16, 18, 20]:
+            polynomial = parse_to_polynomial("{}-0.5".format("*".join("(x-{})".format(k) for k in range(1, n + 1))))
+            for roots in [solve_equation(polynomial, 0.00001, method=ABERTH),
+                          solve_with_complex_roots(polynomial, 0.00001).real_roots]:
+                self.assertEqual(len(roots), n)
+                # the evaluation near the middle roots is rounding noise, they are only known to a few digits
+                for root, expected_root in zip(roots, range(1, n + 1)):
+                    self.assertAlmostEqual(root, expected_root, delta=0.01)
+
+    def test_solve_with_complex_roots(self):
+        solution = solve_with_complex_roots(parse_to_polynomial("6*x^2+11*x+6"), 0.00001)
+        self.assertEqual(solution.real_roots, [])
+        self.assertEqual(len(solution.roots), 2)
+        for expected_root in [(-11 - 23 ** 0.5 * 1j) / 12, (-11 + 23 ** 0.5 * 1j) / 12]:
+            self.assertLess(min(abs(root - expected_root) for root in solution.roots), 1e-12)
+
+        # rational roots are repeated by their multiplicity
+        solution = solve_with_complex_roots(parse_to_polynomial("x*(x-1)^2*(x^2+1)*(2*x+1)"), 0.00001)
+        self.assertEqual(solution.real_roots, [-0.5, 0, 1])
+        self.assertEqual(solution.roots[0], -0.5)
+        self.assertEqual(solution.roots[-2:], [1, 1])
+        self.assertEqual(len(solution.roots), 6)
+        for expected_root in [0, 1j, -1j]:
+            self.assertLess(min(abs(root - expected_root) for root in solution.roots), 1e-12)
+        # a double root that is not rational comes back as two close approximations
+        solution = solve_with_complex_roots(parse_to_polynomial("(x-1.1)^2*(x+2)"), 0.00001)
+        self.assertEqual((len(solution.roots), solution.real_roots), (3, [-2, 1.1]))
+
+        for expression in ["x^5-5*x^3+4*x-0.1", "x^6-7*x^4+14*x^2-7+0.3*x", "x^4+x^2+0.5*x+3",
+                           "0.5*x^9-x^4+2.3*x-0.7", "x^3-7", "2*x+1", "x^2", "5", "0"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                solution = solve_with_complex_roots(polynomial, epsilon)
+                expected_roots = solve_equation(polynomial, epsilon)
+                self.assertEqual(len(solution.real_roots), len(expected_roots))
+                for root, expected_root in zip(solution.real_roots, expected_roots):
+                    self.assertAlmostEqual(root, expected_root, delta=epsilon)
+                self.assertEqual(len(solution.roots), polynomial.get_highest_degree())
+                for root in solution.roots:
+                    self.assertLess(abs(polynomial.eval(root)), 1e-6 * polynomial.get_root_bound() ** len(solution.roots))
+
+    def test_solve_sparse(self):
+        for expression in ["x^40-3*x^20+2", "x^33-2*x^11+0.5*x^2-0.1", "x^64+x^17-1", "x^50-x^3",
+                           "x^45-x^20+0.2*x^3-0.01", "x^32+x^16+1"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                for refinement in [BISECTION, NEWTON]:
+                    roots = solve_equation(polynomial, epsilon, refinement)
+                    expected_roots = solve_equation(polynomial, epsilon, refinement, method=DERIVATIVE)
+                    self.assertEqual(len(roots), len(expected_roots))
+                    for index in range(len(roots)):
+                        self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        # the roots of y^2 - 3y + 2 with y = x^500, the dense solvers lose the pair close to 1 and -1
+        roots = solve_equation(parse_to_polynomial("x^1000-3*x^500+2"), 1e-12)
+        self.assertEqual(roots, [-2 ** (1 / 500), -1, 1, 2 ** (1 / 500)])
+        roots = solve_equation(parse_to_polynomial("x^20001-2*x^3"), 1e-12)
+        self.assertEqual(len(roots), 3)
+        self.assertEqual(roots[1], 0)
+        self.assertAlmostEqual(roots[2], 2 ** (1 / 19998), delta=1e-12)
+        self.assertAlmostEqual(roots[0], -roots[2], delta=1e-12)
+
+    def test_solve_using_sturm(self):
+        for expression in ["x^5-5*x^3+4", "x^5-6*x^4+4", "x^5+x-10", "(x^2-1)*(x^2-4)*(x-3)", "x^6+1", "x^7-x",
+                           "x^4-4*x^2+20*x-7"]:
+            for epsilon in [0.00001, 1e-12]:
+                polynomial = parse_to_polynomial(expression)
+                for refinement in [BISECTION, NEWTON]:
+                    roots = solve_using_sturm(polynomial, epsilon, refinement)
+                    expected_roots = solve_equation(polynomial, epsilon, refinement, method=DERIVATIVE)
+                    self.assertEqual(len(roots), len(expected_roots))
+                    for index in range(len(roots)):
+                        self.assertAlmostEqual(roots[index], expected_roots[index], delta=epsilon)
+
+        roots = parse_and_solve_and_round("(x-1)^2*(x+3)*(x-5)*(x-0.3)", 0.00001, method=STURM)
+        self.assertEqual(roots, [-3, 0.3, 1, 5])
+
+        # Wilkinson-type polynomials, whose Sturm sequences lose terms to rounding unless built exactly
+        for n in [16, 18, 20]:
+            polynomial = parse_to_polynomial("{}-0.5".format("*".join("(x-{})".format(k) for k in range(1, n + 1))))
+            roots = solve_equation(polynomial, 0.00001, method=STURM)
+            self.assertEqual(len(roots), n)
+            # the evaluation near the middle roots is rounding noise, they are only known to a few digits
+            for root, expected_root in zip(roots, range(1, n + 1)):
+                self.assertAlmostEqual(root, expected_root, delta=0.01)
+
+    def test_instrument(self):
+        with instrument() as statistics:
+            roots = parse_and_solve_and_round("x^7-3*x^5+x^2-5=1", 0.00001, method=DERIVATIVE)
+        self.assertEqual(roots, parse_and_solve_and_round("x^7-3*x^5+x^2-5=1", 0.00001, method=DERIVATIVE))
+
+        result = statistics.as_dict()
+        # derivatives of degree 6 and 5 are solved recursively, the one of degree 4 in closed form
+        self.assertEqual(result["counters"]["max_depth"], 2)
+        self.assertGreater(result["counters"]["iterations"], 0)
+        self.assertGreater(result["counters"]["eval_calls"], result["counters"]["iterations"])
+        self.assertGreater(result["counters"]["bracket_expansions"], 0)
+        self.assertEqual(sorted(result["timings"]), ["parse", "solve"])
+
+    def test_solve_for_levels(self):
+        polynomial = parse_to_polynomial("x^5-5*x^3+4*x")
+        levels = [-10, -3.5, -1, 0, 0.5, 2, 3.5, 100]
+        for epsilon in [0.00001, 1e-12]:
+            for refinement in [BISECTION, NEWTON]:
+                results = solve_for_levels(polynomial, levels, epsilon, refinement)
+                for level, roots in zip(levels, results):
+                    shifted = polynomial.minus(parse_to_polynomial(str(level)))
+                    expected_roots = solve_equation(shifted, epsilon, refinement, method=DERIVATIVE)
+                    self.assertEqual(len(roots), len(expected_roots))
+                    for root, expected_root in zip(roots, expected_roots):
+                        self.assertAlmostEqual(root, expected_root, delta=epsilon)
+
+        self.assertEqual(solve_for_levels(parse_to_polynomial("x^2"), [-1, 4], 0.00001), [[], [-2, 2]])
+        self.assertEqual(solve_for_levels(parse_to_polynomial("3"), [3, 4], 0.00001), [["Infinite roots"], []])
+        self.assertEqual(solve_for_levels(parse_to_polynomial("x^5"), [0, 32], 0.00001), [[0], [2]])
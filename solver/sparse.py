@@ -0,0 +1,190 @@
+import unittest
+from math import copysign, gcd, log2
+
+from polynomial import Polynomial, parse_to_polynomial
+
+INF = float('inf')
+MINUS_INF = float('-inf')
+
+# polynomials of at least this degree with at most one coefficient in SPARSE_DENSITY non-zero are solved term by term
+SPARSE_MIN_DEGREE = 16
+SPARSE_DENSITY = 4
+
+
+def get_terms(coefficients):
+    # (degree, coefficient) of the non-zero coefficients, in ascending order of degree
+    return [(degree, coefficient) for degree, coefficient in enumerate(coefficients) if coefficient != 0]
+
+
+def is_sparse(degree, term_count):
+    return degree >= SPARSE_MIN_DEGREE and SPARSE_DENSITY * term_count <= degree + 1
+
+
+def count_sign_changes(coefficients):
+    # Descartes' rule of signs: the number of positive roots is at most the number of sign changes between
+    # consecutive non-zero coefficients, and has the same parity
+    changes = 0
+    previous = 0
+    for coefficient in coefficients:
+        if coefficient * previous < 0:
+            changes += 1
+        if coefficient != 0:
+            previous = coefficient
+    return changes
+
+
+def evaluate_terms(terms, x):
+    x = float(x)
+    try:
+        return sum([coefficient * x ** degree for degree, coefficient in terms])
+    except OverflowError:
+        # some power does not fit in a float, the terms are summed relative to the largest one and the sum then
+        # overflows to the infinity of its sign, as Horner's rule would
+        logarithm = log2(abs(x))
+        exponents = [log2(abs(coefficient)) + degree * logarithm for degree, coefficient in terms]
+        largest = max(exponents)
+        total = sum(copysign(2 ** (exponent - largest), coefficient) * (-1 if x < 0 and degree % 2 == 1 else 1)
+                    for exponent, (degree, coefficient) in zip(exponents, terms))
+        return copysign(INF, total) if total != 0 else 0.0
+
+
+class SparsePolynomial:
+    # A polynomial given by its non-zero terms only, so that x^1000 - 3x^500 + 2 costs three terms instead of 1001
+    # coefficients. It offers the part of the Polynomial interface used by the root finders of solve (eval, compile,
+    # derivative, get_root_bound...), every term costs a single power whatever its degree.
+    __slots__ = ("terms", "degree")
+
+    def __init__(self, terms):
+        # terms as returned by get_terms, at least one of them
+        self.terms = terms
+        self.degree = terms[-1][0]
+
+    @staticmethod
+    def from_coefficients(coefficients):
+        return SparsePolynomial(get_terms(coefficients))
+
+    def to_polynomial(self):
+        coefficients = [0.0] * (self.degree + 1)
+        for degree, coefficient in self.terms:
+            coefficients[degree] = coefficient
+        return Polynomial.from_coefficients(coefficients)
+
+    def __eq__(self, other):
+        if isinstance(other, SparsePolynomial):
+            return self.terms == other.terms
+        else:
+            return False
+
+    def __repr__(self):
+        return " + ".join("{}x^{}".format(coefficient, degree) for degree, coefficient in reversed(self.terms))
+
+    def get_highest_degree(self):
+        return self.degree
+
+    def is_sparse(self):
+        return is_sparse(self.degree, len(self.terms))
+
+    def get_lowest_degree(self):
+        return self.terms[0][0]
+
+    def get_leading_coefficient(self):
+        return self.terms[-1][1]
+
+    def get_signs(self):
+        # the signs of the coefficients of p(x) and of p(-x), for count_sign_changes
+        return ([coefficient for degree, coefficient in self.terms],
+                [-coefficient if degree % 2 == 1 else coefficient for degree, coefficient in self.terms])
+
+    def get_degree_gcd(self):
+        result = 0
+        for degree, coefficient in self.terms:
+            result = gcd(result, degree)
+        return result
+
+    def divide_by_power(self, exponent):
+        # p(x) / x^exponent, exponent at most the lowest degree
+        return SparsePolynomial([(degree - exponent, coefficient) for degree, coefficient in self.terms])
+
+    def substitute_power(self, step):
+        # q such that q(x^step) = p(x), every degree being a multiple of step
+        return SparsePolynomial([(degree // step, coefficient) for degree, coefficient in self.terms])
+
+    def derivative(self):
+        terms = [(degree - 1, degree * coefficient) for degree, coefficient in self.terms if degree > 0]
+        return SparsePolynomial(terms) if len(terms) > 0 else SparsePolynomial([(0, 0.0)])
+
+    def eval(self, x):
+        if x == INF:
+            return self.get_lim_at_inf()
+        if x == MINUS_INF:
+            return self.get_lim_at_minus_inf()
+        return evaluate_terms(self.terms, x)
+
+    def compile(self):
+        terms = self.terms
+
+        def evaluate(x):
+            return evaluate_terms(terms, x)
+
+        return evaluate
+
+    def get_root_bound(self):
+        # With t non-leading terms, |c_i x^d_i| < |c_n x^n| / t for every i as soon as |x| > (t |c_i / c_n|)^(1/(n-d_i)),
+        # so no root lies beyond the largest of these. Unlike Polynomial.get_root_bound the margin shrinks with the
+        # degree, so that the polynomial still fits in a float at the bound.
+        if self.degree == 0:
+            return 0.0
+        leading_coefficient = abs(self.get_leading_coefficient())
+        count = len(self.terms) - 1
+        bound = max((count * abs(coefficient) / leading_coefficient) ** (1 / (self.degree - degree))
+                    for degree, coefficient in self.terms[:-1])
+        return bound * (1 + 1 / self.degree)
+
+    def get_lim_at_inf(self):
+        return INF if self.get_leading_coefficient() > 0 else MINUS_INF
+
+    def get_lim_at_minus_inf(self):
+        if self.degree % 2 == 0:
+            return self.get_lim_at_inf()
+        return MINUS_INF if self.get_leading_coefficient() > 0 else INF
+
+
+class Tests(unittest.TestCase):
+
+    def test_is_sparse(self):
+        for expression, expected in [("x^1000-3*x^500+2", True), ("x^16+x^8+x^4+1", True),
+                                     ("x^16+x^8+x^4+x+1", False), ("x^5+1", False)]:
+            sparse = SparsePolynomial.from_coefficients(parse_to_polynomial(expression).coefficients)
+            self.assertEqual(sparse.is_sparse(), expected)
+
+    def test_count_sign_changes(self):
+        # x^1000 - 3x^500 + 2 and x^1001 - 3x^500 - 2
+        self.assertEqual(count_sign_changes([2, 0, -3, 0, 1]), 2)
+        self.assertEqual(count_sign_changes([-2, 0, -3, 0, 1]), 1)
+        self.assertEqual(count_sign_changes([1, 0, 1]), 0)
+
+    def test_evaluate_terms(self):
+        terms = SparsePolynomial.from_coefficients(parse_to_polynomial("x^1000-3*x^500+2").coefficients).terms
+        self.assertEqual(evaluate_terms(terms, 1), 0)
+        self.assertEqual(evaluate_terms(terms, -1), 0)
+        self.assertAlmostEqual(evaluate_terms(terms, 2 ** (1 / 500)), 0, delta=1e-12)
+        self.assertEqual(evaluate_terms(terms, 3), INF)
+        self.assertEqual(evaluate_terms([(0, 1.0), (1001, -1.0)], -3), INF)
+        self.assertEqual(evaluate_terms([(0, 1.0), (1001, -1.0)], 3), MINUS_INF)
+
+    def test_sparse_polynomial(self):
+        polynomial = parse_to_polynomial("x^40-3*x^20+2")
+        sparse = SparsePolynomial.from_coefficients(polynomial.coefficients)
+        self.assertEqual(sparse.to_polynomial(), polynomial)
+        self.assertEqual(sparse.derivative().to_polynomial(), polynomial.derivative())
+        for x in [-1.1, -1, 0, 0.5, 1.02, MINUS_INF, INF]:
+            self.assertAlmostEqual(sparse.eval(x), polynomial.eval(x), delta=1e-9 * abs(polynomial.eval(x)))
+        self.assertEqual(sparse.get_degree_gcd(), 20)
+        self.assertEqual(sparse.substitute_power(20).to_polynomial(), parse_to_polynomial("x^2-3*x+2"))
+        self.assertEqual(sparse.get_signs(), ([2, -3, 1], [2, -3, 1]))
+
+        sparse = SparsePolynomial.from_coefficients(parse_to_polynomial("x^1000-3*x^500+2").coefficients)
+        bound = sparse.get_root_bound()
+        self.assertTrue(2 ** (1 / 500) < bound < 1.01)
+        self.assertEqual(sparse.eval(bound), sparse.compile()(bound))
+        self.assertGreater(sparse.eval(bound), 0)
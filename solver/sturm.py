@@ -0,0 +1,157 @@
+import unittest
+from math import gcd
+
+from adaptive_precision import exact_sign
+from polynomial import parse_to_polynomial
+
+INF = float('inf')
+MINUS_INF = float('-inf')
+
+
+def to_integers(coefficients):
+    # Every float is a fraction whose denominator is a power of two, multiplying by the largest denominator gives
+    # integers proportional to the coefficients, exactly
+    ratios = [float(coefficient).as_integer_ratio() for coefficient in coefficients]
+    common_denominator = max(denominator for numerator, denominator in ratios)
+    return get_primitive_part([numerator * (common_denominator // denominator) for numerator, denominator in ratios])
+
+
+def get_primitive_part(coefficients):
+    # the integer coefficients divided by their greatest common divisor, which keeps them from growing along the chain
+    common_divisor = 0
+    for coefficient in coefficients:
+        common_divisor = gcd(common_divisor, coefficient)
+    return [coefficient // common_divisor for coefficient in coefficients]
+
+
+def get_remainder(dividend, divisor):
+    # Remainder of the division of two integer coefficient lists in ascending order of degree, multiplied by
+    # |lc(divisor)|^(deg(dividend) - deg(divisor) + 1) so that it stays an integer list (pseudo-remainder). The factor
+    # is positive, the signs the Sturm sequence is made of are the ones of the true remainder.
+    remainder = list(dividend)
+    leading_coefficient = divisor[-1]
+    scale = abs(leading_coefficient)
+    for shift in reversed(range(len(dividend) - len(divisor) + 1)):
+        factor = remainder[shift + len(divisor) - 1] * (1 if leading_coefficient > 0 else -1)
+        remainder = [coefficient * scale for coefficient in remainder]
+        for degree, coefficient in enumerate(divisor):
+            remainder[shift + degree] -= factor * coefficient
+    remainder = remainder[:len(divisor) - 1]
+
+    while len(remainder) > 0 and remainder[-1] == 0:
+        remainder.pop()
+    return remainder
+
+
+def get_sturm_sequence(polynomial):
+    # p0 = p, p1 = p', p(k+1) = -remainder(p(k-1), p(k)), computed exactly on integer coefficients: a remainder
+    # dropped or kept by rounding would change the number of sign changes. Every term is reduced to its primitive
+    # part, a positive multiple that has the same signs. Reference: https://en.wikipedia.org/wiki/Sturm%27s_theorem
+    first = to_integers(polynomial.coefficients)
+    sequence = [first, get_primitive_part([degree * coefficient for degree, coefficient in enumerate(first)][1:])]
+    while len(sequence[-1]) > 1:
+        remainder = get_remainder(sequence[-2], sequence[-1])
+        if len(remainder) == 0:
+            break
+        sequence.append(get_primitive_part([-coefficient for coefficient in remainder]))
+    return sequence
+
+
+def get_sign(coefficients, x):
+    if x == INF or x == MINUS_INF:
+        sign = (coefficients[-1] > 0) - (coefficients[-1] < 0)
+        return -sign if x == MINUS_INF and len(coefficients) % 2 == 0 else sign
+    return exact_sign(coefficients, x)
+
+
+def count_sign_changes(sturm_sequence, x):
+    changes = 0
+    previous_sign = 0
+    for coefficients in sturm_sequence:
+        sign = get_sign(coefficients, x)
+        if sign != 0:
+            if sign == -previous_sign:
+                changes += 1
+            previous_sign = sign
+    return changes
+
+
+def count_real_roots(polynomial, lower=MINUS_INF, upper=INF, sturm_sequence=None):
+    # Number of distinct real roots in (lower, upper], without solving anything
+    if polynomial.get_highest_degree() == 0:
+        return 0
+    if sturm_sequence is None:
+        sturm_sequence = get_sturm_sequence(polynomial)
+    return count_sign_changes(sturm_sequence, lower) - count_sign_changes(sturm_sequence, upper)
+
+
+def isolate_real_roots(polynomial, epsilon, sturm_sequence=None):
+    # Disjoint intervals (lower, upper], each holding exactly one distinct real root, in ascending order. An interval
+    # is split until its ends have opposite signs, or until it is narrower than epsilon (a root of even multiplicity).
+    if polynomial.get_highest_degree() == 0:
+        return []
+    if sturm_sequence is None:
+        sturm_sequence = get_sturm_sequence(polynomial)
+
+    bound = polynomial.get_root_bound()
+    intervals = []
+    stack = [(-bound, bound, count_sign_changes(sturm_sequence, -bound), count_sign_changes(sturm_sequence, bound))]
+    while len(stack) > 0:
+        lower, upper, changes_at_lower, changes_at_upper = stack.pop()
+        count = changes_at_lower - changes_at_upper
+        if count == 0:
+            continue
+        if upper - lower <= epsilon:
+            # roots closer than epsilon cannot be told apart
+            intervals.append((lower, upper))
+            continue
+        value_at_upper = polynomial.eval(upper)
+        if count == 1 and (polynomial.eval(lower) * value_at_upper < 0 or value_at_upper == 0):
+            intervals.append((lower, upper))
+            continue
+
+        middle = (lower + upper) / 2
+        changes_at_middle = count_sign_changes(sturm_sequence, middle)
+        stack.append((middle, upper, changes_at_middle, changes_at_upper))
+        stack.append((lower, middle, changes_at_lower, changes_at_middle))
+
+    return intervals
+
+
+class Tests(unittest.TestCase):
+
+    def test_get_remainder(self):
+        # (x^3 - 2x + 1) mod (x - 1) = 0, (x^2 + 1) mod (x - 2) = 5, 4 (x^2 + 1) mod (-2x + 1) = 5
+        self.assertEqual(get_remainder([1, -2, 0, 1], [-1, 1]), [])
+        self.assertEqual(get_remainder([1, 0, 1], [-2, 1]), [5])
+        self.assertEqual(get_remainder([1, 0, 1], [1, -2]), [5])
+        self.assertEqual(to_integers([0.5, -1.25, 3.0]), [2, -5, 12])
+
+    def test_count_real_roots(self):
+        self.assertEqual(count_real_roots(parse_to_polynomial("x^2+1")), 0)
+        self.assertEqual(count_real_roots(parse_to_polynomial("x^3+6*x^2+11*x+6")), 3)
+        self.assertEqual(count_real_roots(parse_to_polynomial("x^3+6*x^2+11*x+6"), -2.5, 0), 2)
+        self.assertEqual(count_real_roots(parse_to_polynomial("x^5-5*x^3+4"), 0, 10), 2)
+        self.assertEqual(count_real_roots(parse_to_polynomial("(x-1)^2*(x+3)")), 2)
+        self.assertEqual(count_real_roots(parse_to_polynomial("7")), 0)
+
+    def test_isolate_real_roots(self):
+        polynomial = parse_to_polynomial("(x^2-1)*(x^2-4)*(x-3)")
+        intervals = isolate_real_roots(polynomial, 0.00001)
+        self.assertEqual(len(intervals), 5)
+        for (lower, upper), root in zip(intervals, [-2, -1, 1, 2, 3]):
+            self.assertTrue(lower < root <= upper)
+        self.assertEqual(isolate_real_roots(parse_to_polynomial("x^4+1"), 0.00001), [])
+
+    def test_wilkinson(self):
+        # (x - 1)(x - 2)...(x - n), with the constant term shifted by 0.5 too: all n roots stay real
+        for n in [16, 18, 20]:
+            polynomial = parse_to_polynomial("*".join("(x-{})".format(k) for k in range(1, n + 1)))
+            shifted = parse_to_polynomial("{}-0.5".format("*".join("(x-{})".format(k) for k in range(1, n + 1))))
+            self.assertEqual(count_real_roots(polynomial), n)
+            self.assertEqual(count_real_roots(polynomial, 0, 10.5), 10)
+            self.assertEqual(count_real_roots(shifted), n)
+            intervals = isolate_real_roots(shifted, 0.00001)
+            self.assertEqual(len(intervals), n)
+            for (lower, upper), root in zip(intervals, range(1, n + 1)):
+                self.assertTrue(lower < root + 0.5 and root - 0.5 < upper)
@@ -0,0 +1,149 @@
+import unittest
+from typing import List, NamedTuple
+
+from instrumentation import instrument
+from polynomial import Polynomial, parse_to_polynomial
+from solve import CLOSED_FORM_SOLVERS, DERIVATIVE, INF, MINUS_INF, NEWTON, find_root_using_newton,\
+    get_finite_bracket, solve_equation
+
+
+class SweepPoint(NamedTuple):
+    roots: List[float]
+    # roots without a counterpart at the previous point, and roots of the previous point without one here
+    appeared: List[float]
+    vanished: List[float]
+
+
+def pair_by_smallest_gap(roots, count):
+    # Removes count / 2 pairs of neighbouring roots, the closest first, and returns them. Real roots appear and
+    # vanish in pairs through a double root, so the two roots of a new pair are close to each other.
+    roots = list(roots)
+    removed = []
+    for i in range(count // 2):
+        index = min(range(len(roots) - 1), key=lambda index: roots[index + 1] - roots[index])
+        removed.extend(roots[index:index + 2])
+        del roots[index:index + 2]
+    return sorted(removed)
+
+
+class RootTracker:
+    # Real roots of a polynomial whose coefficients change a little from one call of solve to the next. The
+    # critical points come from a tracker of the derivative, every interval between them holds at most one root,
+    # and Newton's method in that interval starts from the root it held at the previous call.
+    def __init__(self, epsilon, counter=None):
+        self.epsilon = epsilon
+        self.counter = counter
+        self.degree = None
+        self.roots = []
+        # for each interval between critical points, the root it holds or None
+        self.interval_roots = None
+        self.derivative_tracker = None
+
+    def solve(self, polynomial):
+        degree = polynomial.get_highest_degree()
+        if degree <= 1 or degree in CLOSED_FORM_SOLVERS:
+            return self.update(degree, solve_equation(polynomial, self.epsilon, counter=self.counter), None)
+
+        if self.derivative_tracker is None or self.degree != degree:
+            self.derivative_tracker = RootTracker(self.epsilon, self.counter)
+        derivative = polynomial.derivative()
+        critical_points = self.derivative_tracker.solve(derivative).roots
+        warm = self.degree == degree and self.interval_roots is not None and\
+            len(self.interval_roots) == len(critical_points) + 1
+
+        lower, upper = get_finite_bracket(polynomial, MINUS_INF, INF, self.counter)
+        check_points = [min([lower] + critical_points)] + critical_points + [max([upper] + critical_points)]
+        evaluate = polynomial.compile()
+        values = [evaluate(x) for x in check_points]
+
+        interval_roots = []
+        for index in range(len(check_points) - 1):
+            # same decisions as find_root
+            root = None
+            if values[index] != 0 and values[index + 1] == 0:
+                root = check_points[index + 1]
+            elif values[index] * values[index + 1] < 0:
+                start = self.interval_roots[index] if warm else None
+                root = find_root_using_newton(polynomial, derivative, self.epsilon, check_points[index],
+                                              check_points[index + 1], self.counter, start)
+            interval_roots.append(root)
+        return self.update(degree, [root for root in interval_roots if root is not None], interval_roots)
+
+    def update(self, degree, roots, interval_roots):
+        if roots == ["Infinite roots"]:
+            # the zero polynomial has no isolated roots to follow
+            roots = []
+        if interval_roots is not None and self.interval_roots is not None and \
+                len(interval_roots) == len(self.interval_roots) and self.degree == degree:
+            appeared = [now for now, before in zip(interval_roots, self.interval_roots)
+                        if now is not None and before is None]
+            vanished = [before for now, before in zip(interval_roots, self.interval_roots)
+                        if now is None and before is not None]
+        elif self.degree is None:
+            appeared, vanished = [], []
+        else:
+            appeared = pair_by_smallest_gap(roots, len(roots) - len(self.roots))
+            vanished = pair_by_smallest_gap(self.roots, len(self.roots) - len(roots))
+
+        self.degree = degree
+        self.roots = roots
+        self.interval_roots = interval_roots
+        return SweepPoint(roots, appeared, vanished)
+
+
+def sweep(base, coefficient_vectors, epsilon, counter=None):
+    # Roots along a sequence of polynomials of the same shape as base, each given by its coefficients in ascending
+    # order of degree (see Polynomial.from_coefficients). base is solved first and every point is then solved
+    # starting from the roots of the point before it. Yields one SweepPoint per coefficient vector.
+    tracker = RootTracker(epsilon, counter)
+    tracker.solve(base)
+    for coefficients in coefficient_vectors:
+        yield tracker.solve(Polynomial.from_coefficients(coefficients))
+
+
+class Tests(unittest.TestCase):
+
+    def test_pair_by_smallest_gap(self):
+        self.assertEqual(pair_by_smallest_gap([-3, 0.9, 1.1, 4], 2), [0.9, 1.1])
+        self.assertEqual(pair_by_smallest_gap([-3, 4], 0), [])
+        self.assertEqual(pair_by_smallest_gap([-3, 4], -2), [])
+
+    def test_without_critical_points(self):
+        base = parse_to_polynomial("x^5+x")
+        points = list(sweep(base, [[-2, 1, 0, 0, 0, 1], [-34, 1, 0, 0, 0, 1]], 0.00001))
+        self.assertEqual([point.roots for point in points], [[1], [2]])
+
+    def test_sweep(self):
+        # x^5 - 5x^3 + 4x = c for c from -4 to 4: five real roots near c = 0, a single one for large |c|
+        base = parse_to_polynomial("x^5-5*x^3+4*x+4")
+        levels = [-4 + 0.05 * i for i in range(161)]
+        vectors = [[-c, 4, 0, -5, 0, 1] for c in levels]
+        for epsilon in [0.00001, 1e-12]:
+            points = list(sweep(base, vectors, epsilon))
+            previous_count = 1
+            for c, point in zip(levels, points):
+                polynomial = Polynomial.from_coefficients([-c, 4, 0, -5, 0, 1])
+                expected_roots = solve_equation(polynomial, epsilon, method=DERIVATIVE)
+                self.assertEqual(len(point.roots), len(expected_roots))
+                for root, expected_root in zip(point.roots, expected_roots):
+                    self.assertAlmostEqual(root, expected_root, delta=epsilon)
+                self.assertEqual(len(point.roots) - previous_count, len(point.appeared) - len(point.vanished))
+                previous_count = len(point.roots)
+
+            events = [(len(point.appeared), len(point.vanished))
+                      for point in points if len(point.appeared) + len(point.vanished) > 0]
+            self.assertEqual(events, [(2, 0), (2, 0), (0, 2), (0, 2)])
+
+    def test_warm_start_evaluations(self):
+        base = parse_to_polynomial("x^6-7*x^4+14*x^2-7+0.3*x")
+        vectors = [[-7, 0.3 + 0.001 * i, 14, 0, -7, 0, 1] for i in range(1, 101)]
+        with instrument() as statistics:
+            points = list(sweep(base, vectors, 1e-12, statistics.counter))
+        self.assertEqual([len(point.roots) for point in points], [6] * 100)
+
+        with instrument() as cold_statistics:
+            for coefficients in vectors:
+                solve_equation(Polynomial.from_coefficients(coefficients), 1e-12, NEWTON, method=DERIVATIVE)
+        counter, cold_counter = statistics.counter, cold_statistics.counter
+        self.assertLess(counter["iterations"] * 2, cold_counter["iterations"])
+        self.assertLess(counter["eval_calls"] * 3, cold_counter["eval_calls"] * 2)